@@ -0,0 +1,144 @@
+"""Media storage for uploaded files such as team logos.
+
+Files are stored under content-hash keys and never modified once written, so
+any URL handed out can be cached forever. LocalMediaStore keeps them on the
+local filesystem, which is also the stand-in for S3 in development.
+S3MediaStore writes to any S3-compatible service through boto3.
+"""
+import asyncio
+import hashlib
+import io
+import os
+from pathlib import Path
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MEDIA_TYPES = {".webp": "image/webp", ".png": "image/png"}
+
+
+class MediaStore:
+    """Where uploaded files live and the URL each one is served from."""
+
+    def __init__(self, public_url):
+        self.public_url = public_url.rstrip("/")
+
+    def url(self, key):
+        return f"{self.public_url}/{key}"
+
+    async def exists(self, key) -> bool:
+        raise NotImplementedError
+
+    async def put(self, key, data, content_type):
+        """Store data under key. Keys are content hashes, so rewriting one is a no-op."""
+        raise NotImplementedError
+
+    async def get(self, key):
+        """Returns (data, content type), or None if there is no such file."""
+        raise NotImplementedError
+
+
+class LocalMediaStore(MediaStore):
+    def __init__(self, root, public_url):
+        super().__init__(public_url)
+        self.root = Path(root).resolve()
+
+    def _path(self, key):
+        path = (self.root / key).resolve()
+        if self.root not in path.parents:
+            raise KeyError(key)
+        return path
+
+    async def exists(self, key) -> bool:
+        return self._path(key).is_file()
+
+    async def put(self, key, data, content_type):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a reader never sees a partial file
+        temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        await asyncio.to_thread(temporary.write_bytes, data)
+        os.replace(temporary, path)
+
+    async def get(self, key):
+        try:
+            path = self._path(key)
+            data = await asyncio.to_thread(path.read_bytes)
+        except (KeyError, FileNotFoundError, IsADirectoryError):
+            return None
+        return data, MEDIA_TYPES.get(path.suffix, "application/octet-stream")
+
+
+class S3MediaStore(MediaStore):
+    """Any S3-compatible service; boto3 is blocking, so calls run on worker threads."""
+
+    def __init__(self, bucket, public_url, endpoint_url=None, region=None):
+        import boto3
+
+        super().__init__(public_url)
+        self.bucket = bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+
+    async def exists(self, key) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(self.client.head_object, Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    async def put(self, key, data, content_type):
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            CacheControl=IMMUTABLE_CACHE_CONTROL
+        )
+
+    async def get(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            response = await asyncio.to_thread(self.client.get_object, Bucket=self.bucket, Key=key)
+        except ClientError:
+            return None
+        return await asyncio.to_thread(response["Body"].read), response["ContentType"]
+
+
+def content_key(prefix, data, suffix):
+    """Key derived from the file's bytes: equal content always lands on the same key."""
+    digest = hashlib.sha256(data).hexdigest()
+    return f"{prefix}/{digest[:2]}/{digest}{suffix}"
+
+
+def render_thumbnails(data, sizes, max_pixels):
+    """Decode an uploaded image and render a square-bounded WebP of each size.
+
+    Returns {size: bytes}. Raises ValueError if data is not an image Pillow can
+    read or is larger than max_pixels. Call on a worker thread; decoding and
+    resizing are CPU-bound.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    try:
+        with Image.open(io.BytesIO(data)) as probe:
+            width, height = probe.size
+            if width * height > max_pixels:
+                raise ValueError(f"Image is larger than {max_pixels} pixels")
+            probe.verify()
+        # verify() leaves the image unusable; decode again for real
+        image = Image.open(io.BytesIO(data))
+        image = ImageOps.exif_transpose(image).convert("RGBA")
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise ValueError(f"Not a readable image: {e}")
+
+    thumbnails = {}
+    for size in sorted(sizes, reverse=True):
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size), Image.LANCZOS)
+        output = io.BytesIO()
+        # Fixed encoder settings keep the output, and so its key, deterministic
+        thumbnail.save(output, format="WEBP", quality=85, method=4)
+        thumbnails[size] = output.getvalue()
+    return thumbnails
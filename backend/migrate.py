@@ -0,0 +1,20 @@
+"""Bootstrap the database once per deployment: indexes and default data.
+
+Run it before starting the API workers and start them with
+BOOTSTRAP_ON_STARTUP=false, so that no worker touches the schema at startup:
+
+    python migrate.py
+"""
+import asyncio
+
+import server
+
+
+async def main():
+    await server.bootstrap()
+    server.logger.info("Bootstrap complete")
+    server.store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,25 +1,253 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from starlette.datastructures import MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.routing import Match
+from pymongo import ASCENDING, DESCENDING, IndexModel, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from storage import MemoryStore, MotorStore
+from media import IMMUTABLE_CACHE_CONTROL, LocalMediaStore, S3MediaStore, content_key, render_thumbnails
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, Field, ValidationError
+from typing import Annotated, Dict, List, Literal, Optional
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import base64
+import codecs
+import csv
+import functools
+import gzip
+import hashlib
+import inspect
+import io
+import json
+import tempfile
+import threading
+import time
+import unicodedata
 import uuid
-from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import formatdate, parsedate_to_datetime
 import jwt
+import orjson
 from passlib.context import CryptContext
 
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Metrics, exposed in Prometheus text format on /metrics
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() == 'true'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+def escape_label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(labels):
+    return ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels)
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        # Per-bucket counts here; made cumulative only when rendered
+        index = 0
+        while index < len(self.buckets) and value > self.buckets[index]:
+            index += 1
+        self.counts[index] += 1
+        self.sum += value
+
+    def render(self, name, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{format_labels(labels + (("le", bound),))}}} {cumulative}')
+        lines.append(f"{name}_sum{{{format_labels(labels)}}} {self.sum}")
+        lines.append(f"{name}_count{{{format_labels(labels)}}} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        # Mongo command events arrive on driver threads
+        self._lock = threading.Lock()
+        self.http_in_flight = {}
+        self.http_requests = {}
+        self.http_latency = {}
+        self.http_response_size = {}
+        self.mongo_operations = {}
+        self.mongo_latency = {}
+
+    def request_started(self, method, route):
+        with self._lock:
+            key = (method, route)
+            self.http_in_flight[key] = self.http_in_flight.get(key, 0) + 1
+
+    def request_finished(self, method, route):
+        with self._lock:
+            # The series stays at zero rather than disappearing between requests
+            self.http_in_flight[(method, route)] -= 1
+
+    def observe_request(self, method, route, status, duration, size):
+        with self._lock:
+            key = (method, route, status)
+            self.http_requests[key] = self.http_requests.get(key, 0) + 1
+            key = (method, route)
+            self.http_latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+            self.http_response_size.setdefault(key, Histogram(SIZE_BUCKETS)).observe(size)
+
+    def observe_mongo(self, collection, command, outcome, duration):
+        with self._lock:
+            key = (collection, command, outcome)
+            self.mongo_operations[key] = self.mongo_operations.get(key, 0) + 1
+            key = (collection, command)
+            self.mongo_latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(duration)
+
+    def render(self):
+        with self._lock:
+            lines = [
+                "# HELP http_requests_in_flight Requests currently being served, by route.",
+                "# TYPE http_requests_in_flight gauge"
+            ]
+            for (method, route), count in sorted(self.http_in_flight.items()):
+                lines.append(f"http_requests_in_flight{{{format_labels((('method', method), ('route', route)))}}} {count}")
+            lines += [
+                "# HELP http_requests_total Requests served, by route and status.",
+                "# TYPE http_requests_total counter"
+            ]
+            for (method, route, status), count in sorted(self.http_requests.items()):
+                lines.append(f"http_requests_total{{{format_labels((('method', method), ('route', route), ('status', status)))}}} {count}")
+            for name, help_text, histograms in (
+                ("http_request_duration_seconds", "Request latency by route.", self.http_latency),
+                ("http_response_size_bytes", "Response body size by route.", self.http_response_size)
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(histograms.items()):
+                    lines += histogram.render(name, (("method", method), ("route", route)))
+            lines += [
+                "# HELP mongodb_operations_total MongoDB commands, by collection and outcome.",
+                "# TYPE mongodb_operations_total counter"
+            ]
+            for (collection, command, outcome), count in sorted(self.mongo_operations.items()):
+                lines.append(f"mongodb_operations_total{{{format_labels((('collection', collection), ('command', command), ('outcome', outcome)))}}} {count}")
+            lines += [
+                "# HELP mongodb_operation_duration_seconds MongoDB command latency by collection.",
+                "# TYPE mongodb_operation_duration_seconds histogram"
+            ]
+            for (collection, command), histogram in sorted(self.mongo_latency.items()):
+                lines += histogram.render("mongodb_operation_duration_seconds", (("collection", collection), ("command", command)))
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        # Only the started event carries the command document (and its collection)
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            # getMore names its collection separately
+            collection = event.command.get("collection")
+        self._collections[event.request_id] = collection if isinstance(collection, str) else "-"
+
+    def _finish(self, event, outcome):
+        collection = self._collections.pop(event.request_id, "-")
+        metrics.observe_mongo(collection, event.command_name, outcome, event.duration_micros / 1e6)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "failure")
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: per-route in-flight count, request count, latency and response size."""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def route_template(scope):
+        """Template of the route the router will pick, so in-flight requests are labelled up front."""
+        partial = "unmatched"
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial == "unmatched":
+                # Path matches but the method does not; the router answers 405 from it
+                partial = route.path
+        return partial
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        
+        start = time.perf_counter()
+        status = 500
+        size = 0
+        
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+        
+        method, route = scope["method"], self.route_template(scope)
+        metrics.request_started(method, route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.request_finished(method, route)
+            metrics.observe_request(method, route, status, time.perf_counter() - start, size)
+
+# Storage: MongoDB by default, or the in-process engine with STORAGE_ENGINE=memory
+STORAGE_ENGINE = os.environ.get('STORAGE_ENGINE', 'mongo').lower()
+if STORAGE_ENGINE == 'memory':
+    store = MemoryStore()
+else:
+    # Motor is the slowest import here; the memory engine never needs it
+    from motor.motor_asyncio import AsyncIOMotorClient
+    
+    client = AsyncIOMotorClient(
+        os.environ['MONGO_URL'],
+        minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+        event_listeners=[MongoCommandMetrics()] if METRICS_ENABLED else []
+    )
+    store = MotorStore(client, os.environ['DB_NAME'], transactions=os.environ.get('MONGO_TRANSACTIONS', 'auto').lower())
+
+# Uploaded files: the local filesystem by default, or S3-compatible storage with MEDIA_STORAGE=s3
+# MEDIA_PUBLIC_URL may point at a CDN or the bucket; otherwise files are served by /api/media
+MEDIA_STORAGE = os.environ.get('MEDIA_STORAGE', 'local').lower()
+MEDIA_PUBLIC_URL = os.environ.get('MEDIA_PUBLIC_URL', '/api/media')
+if MEDIA_STORAGE == 's3':
+    media_store = S3MediaStore(
+        os.environ['MEDIA_S3_BUCKET'],
+        MEDIA_PUBLIC_URL,
+        endpoint_url=os.environ.get('MEDIA_S3_ENDPOINT_URL'),
+        region=os.environ.get('MEDIA_S3_REGION')
+    )
+else:
+    media_store = LocalMediaStore(os.environ.get('MEDIA_ROOT', str(ROOT_DIR / 'media')), MEDIA_PUBLIC_URL)
 
 # Create the main app without a prefix
 app = FastAPI()
@@ -51,6 +279,515 @@ def parse_from_mongo(item):
                     pass
     return item
 
+def search_key(text: str) -> str:
+    """The form names are stored and searched in: Unicode-normalized and case-folded."""
+    return unicodedata.normalize("NFKC", text).casefold().strip()
+
+# Read cache for public endpoints, invalidated by admin writes
+# Entries and versions are kept per festival, so one festival's writes never
+# evict or revalidate another's reads.
+# Versions live in the database, one document per festival, and the write
+# handlers bump them; every worker therefore hands out the same validators and
+# keys its cache on them. A worker re-reads them at most VERSION_TTL_SECONDS
+# after another worker's write, and at once after its own.
+class ReadCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, version_ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_ttl_seconds = version_ttl_seconds
+        self._entries = OrderedDict()
+        self._versions = {}
+        # Invalidations per festival on this worker; a read begun before one is not kept
+        self._writes = {}
+        self.hits = {}
+        self.misses = {}
+        # Called with (festival, collections) after every invalidation
+        self.listeners = []
+
+    async def versions(self, festival: str):
+        """The festival's version document: {"epoch", "versions": {collection: n}, "modified": {collection: time}}."""
+        cached = self._versions.get(festival)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        writes = self._writes.get(festival, 0)
+        
+        async def fetch():
+            return await store.versions.find_one({"_id": festival}) or {}
+        
+        # After a write every request needs the new versions at once; one read serves them all
+        document = await single_flight.do(("versions", festival, writes), fetch)
+        if writes == self._writes.get(festival, 0):
+            self._versions[festival] = (time.monotonic() + self.version_ttl_seconds, document)
+        return document
+
+    async def generations(self, festival: str, collections):
+        document = await self.versions(festival)
+        return tuple(document.get("versions", {}).get(collection, 0) for collection in collections)
+
+    async def validators(self, festival: str, collections):
+        """Strong ETag and Last-Modified timestamp for a festival's data read from these collections."""
+        collections = sorted(set(collections))
+        document = await self.versions(festival)
+        # A festival's version document gets a fresh epoch if it is ever recreated
+        generations = ".".join(str(document.get("versions", {}).get(c, 0)) for c in collections)
+        etag = f'"{document.get("epoch", "0")}-{festival}-{generations}"'
+        last_modified = max(document.get("modified", {}).get(c, 0) for c in collections)
+        return etag, last_modified
+
+    def get(self, festival: str, collection: str, key):
+        cache_key = (festival, collection, key)
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(cache_key)
+            self.hits[collection] = self.hits.get(collection, 0) + 1
+            return True, entry[1]
+        if entry is not None:
+            del self._entries[cache_key]
+        self.misses[collection] = self.misses.get(collection, 0) + 1
+        return False, None
+
+    def set(self, festival: str, collection: str, key, value):
+        cache_key = (festival, collection, key)
+        self._entries[cache_key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, festival: str, *collections: str):
+        await store.versions.update_one(
+            {"_id": festival},
+            {
+                "$inc": {f"versions.{collection}": 1 for collection in collections},
+                "$set": {f"modified.{collection}": time.time() for collection in collections},
+                "$setOnInsert": {"epoch": uuid.uuid4().hex[:8]}
+            },
+            upsert=True
+        )
+        self._writes[festival] = self._writes.get(festival, 0) + 1
+        self._versions.pop(festival, None)
+        for cache_key in [k for k in self._entries if k[0] == festival and k[1] in collections]:
+            del self._entries[cache_key]
+        for listener in self.listeners:
+            listener(festival, collections)
+
+    def stats(self):
+        collections = sorted(set(self.hits) | set(self.misses) | {k[1] for k in self._entries})
+        return {
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "size": len(self._entries),
+            "festivals": len({k[0] for k in self._entries}),
+            "collections": {
+                collection: {
+                    "hits": self.hits.get(collection, 0),
+                    "misses": self.misses.get(collection, 0),
+                    "entries": sum(1 for k in self._entries if k[1] == collection)
+                }
+                for collection in collections
+            }
+        }
+
+read_cache = ReadCache(
+    max_entries=int(os.environ.get('READ_CACHE_MAX_ENTRIES', '256')),
+    ttl_seconds=float(os.environ.get('READ_CACHE_TTL_SECONDS', '30')),
+    version_ttl_seconds=float(os.environ.get('VERSION_TTL_SECONDS', '1'))
+)
+
+# Single-flight: concurrent identical reads share one in-flight load
+# When a result lands, every dashboard misses the cache in the same instant; only
+# the first request queries the database and the rest await its answer.
+class SingleFlight:
+    def __init__(self, max_wait_seconds: float):
+        self.max_wait_seconds = max_wait_seconds
+        self._flights = {}
+        self.leaders = 0
+        self.followers = 0
+        self.timeouts = 0
+
+    async def do(self, key, work):
+        """Return work()'s result, sharing one run among concurrent callers with the same key.
+
+        A caller that joins a run gives up after max_wait_seconds and runs work()
+        itself. The shared run is shielded, so a caller that disconnects does not
+        cancel it for the others.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            self.leaders += 1
+            flight = asyncio.ensure_future(work())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda _: self._flights.pop(key, None))
+            return await asyncio.shield(flight)
+        self.followers += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight), self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return await work()
+
+    def stats(self):
+        return {
+            "max_wait_seconds": self.max_wait_seconds,
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "timeouts": self.timeouts
+        }
+
+single_flight = SingleFlight(max_wait_seconds=float(os.environ.get('COALESCE_MAX_WAIT_SECONDS', '2')))
+
+def cached(collection: str, *depends_on: str):
+    """Cache a loader's value until a write invalidates collection.
+
+    Loaders that also read other collections name them in depends_on. The
+    versions of all of them are part of the key, so a write to any of them,
+    on any worker, forces a miss.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            # Direct calls (e.g. from the dashboard) and routed calls share entries
+            bound = signature.bind(**kwargs)
+            bound.apply_defaults()
+            festival = bound.arguments["festival"]
+            key = (
+                (func.__name__,)
+                + await read_cache.generations(festival, (collection,) + depends_on)
+                + tuple(sorted(bound.arguments.items()))
+            )
+            hit, value = read_cache.get(festival, collection, key)
+            if hit:
+                return value
+            # A write bumps the version, so later requests never join a stale load
+            value = await single_flight.do((festival, collection, key), lambda: func(**kwargs))
+            read_cache.set(festival, collection, key, value)
+            return value
+        wrapper.collections = (collection,) + depends_on
+        return wrapper
+    return decorator
+
+# Conditional GET and compression for public reads
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison, ignoring the suffix CompressionMiddleware adds per encoding."""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/").strip('"')
+        for suffix in ENCODING_SUFFIXES:
+            candidate = candidate.removesuffix(suffix)
+        if candidate == etag.strip('"'):
+            return True
+    return False
+
+async def versioned_response(request: Request, festival: str, collections, load):
+    """Serve load() with an ETag and Last-Modified, or 304 if the client's copy is current.
+
+    The version is read before loading, so a write that lands meanwhile makes the
+    next request miss instead of labelling a stale body with the new version.
+    """
+    etag, last_modified = await read_cache.validators(festival, collections)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        # Clients may keep the body but must revalidate before using it
+        "Cache-Control": "no-cache",
+        "Vary": "X-Festival"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        fresh = etag_matches(if_none_match, etag)
+    elif if_modified_since is not None:
+        try:
+            fresh = int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            fresh = False
+    else:
+        fresh = False
+    if fresh:
+        return Response(status_code=304, headers=headers)
+    
+    async def render():
+        return orjson.dumps(await load(), option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    
+    # The ETag names the data version, so concurrent requests for the same URL
+    # and version share one load and one serialized body
+    body = await single_flight.do(("response", request.url.path, str(request.query_params), etag), render)
+    return Response(body, media_type="application/json", headers=headers)
+
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', '1024'))
+# Larger bodies are compressed on a worker thread instead of stalling the event loop
+COMPRESSION_THREAD_MIN_BYTES = int(os.environ.get('COMPRESSION_THREAD_MIN_BYTES', str(64 * 1024)))
+COMPRESSION_CACHE_ENTRIES = int(os.environ.get('COMPRESSION_CACHE_ENTRIES', '64'))
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for coding in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if accepted.get(coding, accepted.get("*", 0)) > 0:
+            return coding
+    return None
+
+def compress(body: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+class CompressionMiddleware:
+    """Pure ASGI middleware: brotli or gzip for whole JSON bodies above a size threshold.
+
+    Streamed responses pass through untouched. A compressed response's ETag gets
+    an encoding suffix so each representation keeps a distinct strong tag.
+    Bodies with an ETag are compressed once per URL, version and encoding, and
+    the result is shared by concurrent and later requests.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES, max_entries: int = COMPRESSION_CACHE_ENTRIES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_entries = max_entries
+        self._compressed = OrderedDict()
+
+    async def compress(self, scope, body: bytes, coding: str, etag: Optional[str]) -> bytes:
+        async def work():
+            if len(body) >= COMPRESSION_THREAD_MIN_BYTES:
+                return await asyncio.to_thread(compress, body, coding)
+            return compress(body, coding)
+        
+        if etag is None:
+            return await work()
+        # The ETag names the data version, not the URL; endpoints reading the same collections share it
+        key = (scope["path"], scope["query_string"], etag, coding)
+        compressed = self._compressed.get(key)
+        if compressed is not None:
+            self._compressed.move_to_end(key)
+            return compressed
+        compressed = await single_flight.do(("compressed",) + key, work)
+        self._compressed[key] = compressed
+        while len(self._compressed) > self.max_entries:
+            self._compressed.popitem(last=False)
+        return compressed
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_headers = dict(scope["headers"])
+        coding = negotiate_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            passthrough = True
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start["headers"]))
+            eligible = (
+                not message.get("more_body", False)
+                and headers.get("content-type", "").startswith("application/json")
+                and "content-encoding" not in headers
+                and len(body) >= self.minimum_size
+            )
+            if eligible:
+                headers.add_vary_header("Accept-Encoding")
+                if coding is not None:
+                    body = await self.compress(scope, body, coding, headers.get("etag"))
+                    headers["Content-Encoding"] = coding
+                    headers["Content-Length"] = str(len(body))
+                    if "etag" in headers:
+                        headers["ETag"] = headers["etag"][:-1] + f'-{coding}"'
+                    message = {**message, "body": body}
+            await send({**start, "headers": headers.raw})
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+        if start is not None and not passthrough:
+            # Headers only, e.g. a 304
+            await send(start)
+
+# Keyset pagination and streaming for list endpoints
+def encode_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != 2:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+# Lean reads: project the model's fields and encode the stored documents directly
+@functools.lru_cache(maxsize=None)
+def lean_shape(model):
+    """Projection and defaults that give a stored document the model's JSON shape."""
+    projection = {"_id": 0, **{name: 1 for name in model.model_fields}}
+    defaults = {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if field.default_factory is None and not field.is_required()
+    }
+    return projection, defaults
+
+async def find_lean(model, repository, query=None, sort=None):
+    projection, defaults = lean_shape(model)
+    return [{**defaults, **document} for document in await repository.find(query, projection, sort)]
+
+async def paginate(
+    repository,
+    model,
+    sort_field: str,
+    limit: Optional[int],
+    cursor: Optional[str],
+    stream: Optional[str],
+    match: Optional[dict] = None
+):
+    """Page through the documents matching match in (sort_field, id) order, covered by an index.
+
+    A page is returned as a JSON list with the opaque token for the next page in
+    the X-Next-Cursor header. With stream set, documents are encoded one at a time
+    straight from the storage cursor as NDJSON or a JSON array.
+    """
+    query = dict(match or {})
+    if cursor:
+        after_value, after_id = decode_cursor(cursor)
+        query["$or"] = [
+            {sort_field: {"$gt": after_value}},
+            {sort_field: after_value, "id": {"$gt": after_id}}
+        ]
+    projection, defaults = lean_shape(model)
+    sort = [(sort_field, ASCENDING), ("id", ASCENDING)]
+    
+    if stream:
+        documents = repository.iterate(query, projection, sort, limit)
+        
+        async def encode():
+            first = True
+            if stream == "json":
+                yield b"["
+            async for document in documents:
+                item = orjson.dumps({**defaults, **document})
+                if stream == "ndjson":
+                    yield item + b"\n"
+                else:
+                    yield item if first else b"," + item
+                first = False
+            if stream == "json":
+                yield b"]"
+        
+        media_type = "application/x-ndjson" if stream == "ndjson" else "application/json"
+        return StreamingResponse(encode(), media_type=media_type)
+    
+    # Fetch one extra document to learn whether another page exists
+    page = await repository.find(query, projection, sort, limit=limit + 1)
+    headers = {}
+    if len(page) > limit:
+        page = page[:limit]
+        headers["X-Next-Cursor"] = encode_cursor([page[-1].get(sort_field), page[-1]["id"]])
+    return ORJSONResponse([{**defaults, **document} for document in page], headers=headers)
+
+PageLimit = Annotated[Optional[int], Query(ge=1, le=1000)]
+StreamFormat = Annotated[Optional[Literal["ndjson", "json"]], Query()]
+DEFAULT_PAGE_LIMIT = 100
+
+# Live updates: one in-process broadcaster fans every write out to all subscribers
+class LiveBroadcaster:
+    def __init__(self, history_size: int, queue_size: int):
+        # Tokens from a previous process never resume against this one
+        self.epoch = uuid.uuid4().hex[:8]
+        self.queue_size = queue_size
+        self._sequence = 0
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+
+    def token(self, sequence: int) -> str:
+        return f"{self.epoch}:{sequence}"
+
+    def publish(self, event_type: str, data):
+        self._sequence += 1
+        # Serialize once here rather than once per subscriber
+        message = (
+            f"id: {self.token(self._sequence)}\n"
+            f"event: {event_type}\n"
+            f"data: {json.dumps(jsonable_encoder(data))}\n\n"
+        )
+        self._history.append((self._sequence, message))
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Drop slow consumers; they reconnect and resume from their token
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def subscribe(self, resume_token: Optional[str] = None):
+        """Register a subscriber and return its queue plus the messages it missed."""
+        backlog = []
+        if resume_token:
+            epoch, _, sequence = resume_token.partition(":")
+            oldest = self._history[0][0] if self._history else self._sequence + 1
+            if epoch != self.epoch or not sequence.isdigit() or int(sequence) + 1 < oldest:
+                backlog.append(
+                    f"id: {self.token(self._sequence)}\n"
+                    f"event: reset\n"
+                    f"data: {{}}\n\n"
+                )
+            else:
+                backlog.extend(message for seq, message in self._history if seq > int(sequence))
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue, backlog
+
+    def unsubscribe(self, queue):
+        self._subscribers.discard(queue)
+
+LIVE_HISTORY_SIZE = int(os.environ.get('LIVE_HISTORY_SIZE', '500'))
+LIVE_QUEUE_SIZE = int(os.environ.get('LIVE_QUEUE_SIZE', '100'))
+LIVE_HEARTBEAT_SECONDS = float(os.environ.get('LIVE_HEARTBEAT_SECONDS', '15'))
+live_channels = {}
+
+def live_channel(festival: str) -> LiveBroadcaster:
+    """Each festival's subscribers only hear about that festival's writes."""
+    channel = live_channels.get(festival)
+    if channel is None:
+        channel = live_channels[festival] = LiveBroadcaster(LIVE_HISTORY_SIZE, LIVE_QUEUE_SIZE)
+    return channel
+
+# Festivals: one deployment hosts many; every document carries its festival_id
+DEFAULT_FESTIVAL = os.environ.get('DEFAULT_FESTIVAL', 'default')
+FESTIVAL_PATTERN = r"^[a-z0-9][a-z0-9-]{0,63}$"
+
+async def current_festival(
+    festival: Annotated[Optional[str], Query(pattern=FESTIVAL_PATTERN)] = None,
+    x_festival: Annotated[Optional[str], Header(alias="X-Festival", pattern=FESTIVAL_PATTERN)] = None
+) -> str:
+    """?festival= (which EventSource can send), else the X-Festival header, else the default."""
+    return festival or x_festival or DEFAULT_FESTIVAL
+
+Festival = Annotated[str, Depends(current_festival)]
+
 # Models
 class Admin(BaseModel):
     username: str
@@ -60,16 +797,25 @@ class AdminLogin(BaseModel):
     username: str
     password: str
 
+class AdminAccount(BaseModel):
+    username: str
+    password: str
+    # The festivals the account administers; None for every festival
+    festivals: Optional[List[Annotated[str, Field(pattern=FESTIVAL_PATTERN)]]] = None
+
 class Team(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    festival_id: str = DEFAULT_FESTIVAL  # set from the request, not the body
     name: str
     color: str
     logo_url: Optional[str] = None
+    logo_urls: Dict[str, str] = {}  # thumbnail URL per size, set by a logo upload
     total_points: int = 0
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class Member(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    festival_id: str = DEFAULT_FESTIVAL  # set from the request, not the body
     name: str
     category: str  # Adult or Kid
     team_id: str
@@ -78,6 +824,7 @@ class Member(BaseModel):
 
 class Event(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    festival_id: str = DEFAULT_FESTIVAL  # set from the request, not the body
     name: str
     description: str
     event_date: datetime
@@ -88,6 +835,7 @@ class Event(BaseModel):
 
 class Result(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    festival_id: str = DEFAULT_FESTIVAL  # set from the request, not the body
     event_id: str
     winner_team_id: Optional[str] = None
     runner_up_team_id: Optional[str] = None
@@ -109,219 +857,1868 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# bcrypt is deliberately slow; keep it off the event loop and cap how much can queue up
+auth_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('AUTH_WORKERS', '2')),
+    thread_name_prefix="auth"
+)
+auth_slots = asyncio.Semaphore(int(os.environ.get('AUTH_MAX_PENDING', '16')))
+
+async def run_auth_work(func, *args):
+    if auth_slots.locked():
+        raise HTTPException(status_code=503, detail="Too many concurrent logins, try again shortly")
+    async with auth_slots:
+        return await asyncio.get_running_loop().run_in_executor(auth_executor, func, *args)
+
+async def verify_password_async(plain_password, hashed_password):
+    return await run_auth_work(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await run_auth_work(get_password_hash, password)
+
+class LoginThrottle:
+    """Sliding-window limit on failed logins per username."""
+
+    def __init__(self, max_failures: int, window_seconds: float, max_usernames: int = 10000):
+        self.max_failures = max_failures
+        self.window_seconds = window_seconds
+        self.max_usernames = max_usernames
+        self._failures = OrderedDict()
+
+    def _recent(self, username: str):
+        failures = self._failures.get(username)
+        if failures is None:
+            return None
+        cutoff = time.monotonic() - self.window_seconds
+        while failures and failures[0] < cutoff:
+            failures.popleft()
+        return failures
+
+    def retry_after(self, username: str) -> int:
+        """Seconds until the username may try again, or 0 if it may now."""
+        failures = self._recent(username)
+        if not failures or len(failures) < self.max_failures:
+            return 0
+        return int(failures[0] + self.window_seconds - time.monotonic()) + 1
+
+    def failed(self, username: str):
+        failures = self._recent(username)
+        if failures is None:
+            failures = self._failures[username] = deque(maxlen=self.max_failures)
+        failures.append(time.monotonic())
+        self._failures.move_to_end(username)
+        while len(self._failures) > self.max_usernames:
+            self._failures.popitem(last=False)
+
+    def succeeded(self, username: str):
+        self._failures.pop(username, None)
+
+login_throttle = LoginThrottle(
+    max_failures=int(os.environ.get('LOGIN_MAX_FAILURES', '5')),
+    window_seconds=float(os.environ.get('LOGIN_WINDOW_SECONDS', '300'))
+)
+
 def create_access_token(data: dict):
     return jwt.encode(data, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(security)):
+# Verified tokens, so bursts of admin calls skip the JWT decode
+TOKEN_CACHE_TTL_SECONDS = float(os.environ.get('TOKEN_CACHE_TTL_SECONDS', '60'))
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', '256'))
+verified_tokens = OrderedDict()
+
+# Admin accounts may be scoped to festivals; the scope travels in the token, so
+# a scope change takes effect at the account's next login.
+async def verified_admin(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """(username, festivals) for a valid token; festivals is None for an admin of every festival."""
+    token = credentials.credentials
+    cached_token = verified_tokens.get(token)
+    if cached_token is not None and cached_token[0] > time.monotonic():
+        return cached_token[1:]
+    
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid token")
-        return username
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    expires = time.monotonic() + TOKEN_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        # Never trust a cached token past its own expiry
+        expires = min(expires, time.monotonic() + payload["exp"] - time.time())
+    festivals = payload.get("festivals")
+    verified_tokens[token] = (expires, username, festivals)
+    verified_tokens.move_to_end(token)
+    while len(verified_tokens) > TOKEN_CACHE_MAX_ENTRIES:
+        verified_tokens.popitem(last=False)
+    return username, festivals
 
-# Initialize default data
-@app.on_event("startup")
-async def startup_event():
-    # Create default admin
-    admin_exists = await db.admins.find_one({"username": "admin"})
-    if not admin_exists:
-        admin_data = {
-            "username": "admin",
-            "password": get_password_hash("admin123")
-        }
-        await db.admins.insert_one(admin_data)
+async def get_current_admin(festival: Festival, admin=Depends(verified_admin)):
+    """The admin's username, if the account administers the festival the request names."""
+    username, festivals = admin
+    if festivals is not None and festival not in festivals:
+        raise HTTPException(status_code=403, detail="Not an admin of this festival")
+    return username
+
+async def get_deployment_admin(admin=Depends(verified_admin)):
+    """The admin's username, if the account administers every festival.
+
+    Operations that span festivals, like indexes and reconciliation, need one.
+    """
+    username, festivals = admin
+    if festivals is not None:
+        raise HTTPException(status_code=403, detail="Needs an admin of every festival")
+    return username
+
+# Indexes: declared here, created idempotently at startup
+# Per-festival reads use indexes that lead with festival_id, so a festival's
+# queries only ever walk its own keys however many festivals share the database.
+INDEXES = {
+    "admins": [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True)
+    ],
+    "teams": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("festival_id", ASCENDING), ("total_points", DESCENDING)], name="festival_total_points"),
+        IndexModel([("festival_id", ASCENDING), ("created_at", ASCENDING)], name="festival_created_at")
+    ],
+    "members": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("team_id", ASCENDING)], name="team_id"),
+        IndexModel(
+            [("festival_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+            name="festival_created_at_id"
+        ),
+        IndexModel(
+            [("festival_id", ASCENDING), ("category", ASCENDING), ("individual_points", DESCENDING), ("id", ASCENDING)],
+            name="festival_category_individual_points_id"
+        ),
+        # Name search walks one festival's key range in name order
+        IndexModel(
+            [("festival_id", ASCENDING), ("name_key", ASCENDING), ("id", ASCENDING)],
+            name="festival_name_key_id"
+        )
+    ],
+    "events": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("festival_id", ASCENDING), ("event_date", ASCENDING), ("id", ASCENDING)],
+            name="festival_event_date_id"
+        )
+    ],
+    "results": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("event_id", ASCENDING)], name="event_id_unique", unique=True),
+        # Reconciliation's watermark spans festivals
+        IndexModel([("recorded_at", ASCENDING)], name="recorded_at"),
+        IndexModel([("points_pending_since", ASCENDING)], name="points_pending_since", sparse=True),
+        IndexModel(
+            [("festival_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+            name="festival_created_at_id"
+        ),
+        IndexModel(
+            [("idempotency_key", ASCENDING)],
+            name="idempotency_key_unique",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        )
+    ],
+    "points_config": [
+        IndexModel([("festival_id", ASCENDING)], name="festival_unique", unique=True)
+    ],
+    "timeline": [
+        # Also what keeps concurrent writers to one hour bucket from both inserting it
+        IndexModel(
+            [("festival_id", ASCENDING), ("kind", ASCENDING), ("seq", ASCENDING)],
+            name="festival_kind_seq_unique",
+            unique=True
+        ),
+        IndexModel([("festival_id", ASCENDING), ("result_id", ASCENDING)], name="festival_result_id")
+    ]
+}
+
+async def check_indexes():
+    """Compare the declared indexes with what exists in the database."""
+    report = {"present": [], "missing": []}
+    for collection, indexes in INDEXES.items():
+        existing = await store[collection].index_information()
+        for index in indexes:
+            name = index.document["name"]
+            report["present" if name in existing else "missing"].append(f"{collection}.{name}")
+    return report
+
+async def ensure_indexes():
+    report = {"created": [], "existing": [], "failed": []}
+    for collection, indexes in INDEXES.items():
+        existing = await store[collection].index_information()
+        for index in indexes:
+            name = index.document["name"]
+            if name in existing:
+                report["existing"].append(f"{collection}.{name}")
+                continue
+            try:
+                await store[collection].create_index(index)
+                report["created"].append(f"{collection}.{name}")
+            except PyMongoError as e:
+                # e.g. duplicate ids already stored; keep serving and report it
+                logger.error(f"Could not create index {collection}.{name}: {e}")
+                report["failed"].append(f"{collection}.{name}")
+    logger.info(f"Indexes created: {report['created'] or 'none'}; failed: {report['failed'] or 'none'}")
+    return report
+
+# Bootstrap: indexes and default data, once per deployment
+# Default documents have fixed keys, so workers bootstrapping at the same time
+# collide on insert instead of seeding duplicates.
+BOOTSTRAP_VERSION = 4
+FESTIVAL_COLLECTIONS = ("teams", "members", "events", "results", "points_config")
+DEFAULT_TEAMS = [("Team Maveli", "#FF6B35"), ("Team Vamanan", "#4ECDC4")]
+AUTO_CREATE_INDEXES = os.environ.get('AUTO_CREATE_INDEXES', 'true').lower() == 'true'
+bootstrap_state = {"current": False}
+
+def declared_indexes():
+    return sorted(f"{collection}.{index.document['name']}" for collection, indexes in INDEXES.items() for index in indexes)
+
+async def bootstrap_is_current() -> bool:
+    # A newly declared index re-runs the bootstrap on the next deployment
+    marker = await store.migrations.find_one({"_id": "bootstrap"})
+    return bool(marker) and marker.get("version") == BOOTSTRAP_VERSION and marker.get("indexes") == declared_indexes()
+
+async def bootstrap(create_indexes: bool = True):
+    """Create the indexes and seed the default admin, teams and points config.
+
+    Idempotent and safe to run from several processes at once.
+    """
+    # Data from before festivals existed belongs to the default festival
+    for collection in FESTIVAL_COLLECTIONS:
+        await store[collection].update_many(
+            {"festival_id": {"$exists": False}}, {"$set": {"festival_id": DEFAULT_FESTIVAL}}
+        )
     
-    # Create default teams
-    teams_count = await db.teams.count_documents({})
-    if teams_count == 0:
-        default_teams = [
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Team Maveli",
-                "color": "#FF6B35",
-                "total_points": 0,
-                "created_at": datetime.now(timezone.utc).isoformat()
-            },
-            {
-                "id": str(uuid.uuid4()),
-                "name": "Team Vamanan",
-                "color": "#4ECDC4",
+    if create_indexes:
+        await ensure_indexes()
+    
+    if not await store.admins.find_one({"username": "admin"}, {"_id": 1}):
+        try:
+            await store.admins.insert_one({
+                "_id": "default-admin",
+                "username": "admin",
+                "password": await get_password_hash_async("admin123")
+            })
+        except DuplicateKeyError:
+            pass
+    
+    if await store.teams.count({"festival_id": DEFAULT_FESTIVAL}) == 0:
+        now = datetime.now(timezone.utc).isoformat()
+        default_teams = []
+        for name, color in DEFAULT_TEAMS:
+            team_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"heightsonam/{DEFAULT_FESTIVAL}/default-team/{name}"))
+            default_teams.append({
+                "_id": team_id,
+                "id": team_id,
+                "festival_id": DEFAULT_FESTIVAL,
+                "name": name,
+                "color": color,
                 "total_points": 0,
-                "created_at": datetime.now(timezone.utc).isoformat()
-            }
-        ]
-        await db.teams.insert_many(default_teams)
+                "created_at": now
+            })
+        # Unordered; any duplicate key just means another worker seeded first
+        await store.teams.insert_many(default_teams)
+    
+    if not await store.points_config.find_one({"festival_id": DEFAULT_FESTIVAL}, {"_id": 1}):
+        try:
+            await store.points_config.insert_one({
+                "_id": f"points-config-{DEFAULT_FESTIVAL}",
+                "festival_id": DEFAULT_FESTIVAL,
+                "winner_points": 10,
+                "runner_up_points": 5
+            })
+        except DuplicateKeyError:
+            pass
+    
+    # Members added before name search existed
+    members = store.members.iterate({"name_key": {"$exists": False}}, {"_id": 0, "id": 1, "name": 1})
+    batch = []
+    async for member in members:
+        batch.append(({"id": member["id"]}, {"$set": {"name_key": search_key(member.get("name", ""))}}))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await store.members.bulk_update(batch, ordered=False)
+            batch = []
+    await store.members.bulk_update(batch, ordered=False)
     
-    # Create default points config
-    config_exists = await db.points_config.find_one({})
-    if not config_exists:
-        await db.points_config.insert_one({"winner_points": 10, "runner_up_points": 5})
+    # Results recorded before the timeline existed
+    festivals = {result["festival_id"] async for result in store.results.iterate({}, {"_id": 0, "festival_id": 1})}
+    for festival in festivals:
+        if not await store.timeline.find_one({"_id": f"{festival}:totals"}, {"_id": 1}):
+            await rebuild_timeline(festival)
+    
+    await read_cache.invalidate(DEFAULT_FESTIVAL, "teams", "points_config")
+    await store.migrations.replace_one(
+        {"_id": "bootstrap"},
+        {
+            "version": BOOTSTRAP_VERSION,
+            # Left empty when indexes are managed elsewhere, so startup keeps checking
+            "indexes": declared_indexes() if create_indexes else [],
+            "completed_at": datetime.now(timezone.utc).isoformat()
+        },
+        upsert=True
+    )
+    bootstrap_state["current"] = True
+
+@app.on_event("startup")
+async def startup_event():
+    # Already bootstrapped deployments cost one round trip, which also opens the pool.
+    # With BOOTSTRAP_ON_STARTUP=false, run `python migrate.py` once per deployment instead.
+    if os.environ.get('BOOTSTRAP_ON_STARTUP', 'true').lower() != 'true':
+        return
+    if await bootstrap_is_current():
+        bootstrap_state["current"] = True
+    else:
+        await bootstrap(create_indexes=AUTO_CREATE_INDEXES)
 
 # Auth endpoints
 @api_router.post("/auth/login")
 async def login(admin_data: AdminLogin):
-    admin = await db.admins.find_one({"username": admin_data.username})
-    if not admin or not verify_password(admin_data.password, admin["password"]):
+    retry_after = login_throttle.retry_after(admin_data.username)
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    admin = await store.admins.find_one({"username": admin_data.username})
+    if not admin or not await verify_password_async(admin_data.password, admin["password"]):
+        login_throttle.failed(admin_data.username)
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    login_throttle.succeeded(admin_data.username)
     
-    access_token = create_access_token(data={"sub": admin_data.username})
+    claims = {"sub": admin_data.username}
+    if admin.get("festivals") is not None:
+        claims["festivals"] = admin["festivals"]
+    access_token = create_access_token(data=claims)
     return {"access_token": access_token, "token_type": "bearer"}
 
+@api_router.post("/admin/accounts")
+async def create_admin_account(account: AdminAccount, current_admin: str = Depends(get_deployment_admin)):
+    """Add an admin, scoped to festivals or, without festivals, for the whole deployment."""
+    document = {"username": account.username, "password": await get_password_hash_async(account.password)}
+    if account.festivals is not None:
+        document["festivals"] = account.festivals
+    try:
+        await store.admins.insert_one(document)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="An admin with this username already exists")
+    return {"username": account.username, "festivals": account.festivals}
+
 # Public endpoints (no auth required)
+# Handlers return ORJSONResponse directly; response_model only documents the shape
+@cached("teams")
+async def list_teams(festival: str):
+    return await find_lean(Team, store.teams, {"festival_id": festival}, [("created_at", ASCENDING)])
+
 @api_router.get("/teams", response_model=List[Team])
-async def get_teams():
-    teams = await db.teams.find().to_list(length=None)
-    return [Team(**parse_from_mongo(team)) for team in teams]
+async def get_teams(request: Request, festival: Festival):
+    return await versioned_response(request, festival, ["teams"], lambda: list_teams(festival=festival))
+
+@cached("members")
+async def list_members(festival: str):
+    return await find_lean(Member, store.members, {"festival_id": festival}, [("created_at", ASCENDING), ("id", ASCENDING)])
 
 @api_router.get("/members", response_model=List[Member])
-async def get_members():
-    members = await db.members.find().to_list(length=None)
-    return [Member(**parse_from_mongo(member)) for member in members]
+async def get_members(
+    request: Request,
+    festival: Festival,
+    limit: PageLimit = None,
+    cursor: Optional[str] = None,
+    stream: StreamFormat = None
+):
+    if limit is None and cursor is None and stream is None:
+        return await versioned_response(request, festival, ["members"], lambda: list_members(festival=festival))
+    if limit is None and not stream:
+        limit = DEFAULT_PAGE_LIMIT
+    return await paginate(store.members, Member, "created_at", limit, cursor, stream, {"festival_id": festival})
+
+# Autocomplete: a prefix of any case matches, without shipping the whole roster
+# Not read-cached: every keystroke is a new key, and they would evict the hot
+# entries from the shared LRU. The indexed range query is cheap enough to repeat.
+SEARCH_FIELDS = {"_id": 0, "id": 1, "name": 1, "category": 1, "team_id": 1}
+
+async def search_members(
+    festival: str, q: str, team_id: Optional[str] = None, category: Optional[str] = None, limit: int = 10
+):
+    query = {"festival_id": festival}
+    prefix = search_key(q)
+    if prefix:
+        # Every key starting with the prefix sorts between these bounds
+        query["name_key"] = {"$gte": prefix, "$lt": prefix + "\U0010ffff"}
+    if team_id:
+        query["team_id"] = team_id
+    if category:
+        query["category"] = category
+    return await store.members.find(query, SEARCH_FIELDS, [("name_key", ASCENDING), ("id", ASCENDING)], limit=limit)
+
+@api_router.get("/members/search")
+async def get_member_search(
+    request: Request,
+    festival: Festival,
+    q: Annotated[str, Query(max_length=100)] = "",
+    team_id: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10
+):
+    return await versioned_response(
+        request,
+        festival,
+        ["members"],
+        lambda: search_members(festival=festival, q=q, team_id=team_id, category=category, limit=limit)
+    )
+
+@cached("members")
+async def list_members_by_team(festival: str, team_id: str):
+    return await find_lean(Member, store.members, {"festival_id": festival, "team_id": team_id})
 
 @api_router.get("/members/team/{team_id}", response_model=List[Member])
-async def get_members_by_team(team_id: str):
-    members = await db.members.find({"team_id": team_id}).to_list(length=None)
-    return [Member(**parse_from_mongo(member)) for member in members]
+async def get_members_by_team(team_id: str, request: Request, festival: Festival):
+    return await versioned_response(
+        request, festival, ["members"], lambda: list_members_by_team(festival=festival, team_id=team_id)
+    )
+
+@cached("events")
+async def list_events(festival: str):
+    return await find_lean(Event, store.events, {"festival_id": festival}, [("event_date", ASCENDING), ("id", ASCENDING)])
 
 @api_router.get("/events", response_model=List[Event])
-async def get_events():
-    events = await db.events.find().sort("event_date", 1).to_list(length=None)
-    return [Event(**parse_from_mongo(event)) for event in events]
+async def get_events(
+    request: Request,
+    festival: Festival,
+    limit: PageLimit = None,
+    cursor: Optional[str] = None,
+    stream: StreamFormat = None
+):
+    if limit is None and cursor is None and stream is None:
+        return await versioned_response(request, festival, ["events"], lambda: list_events(festival=festival))
+    if limit is None and not stream:
+        limit = DEFAULT_PAGE_LIMIT
+    return await paginate(store.events, Event, "event_date", limit, cursor, stream, {"festival_id": festival})
+
+@cached("results")
+async def list_results(festival: str):
+    return await find_lean(Result, store.results, {"festival_id": festival}, [("created_at", ASCENDING), ("id", ASCENDING)])
 
 @api_router.get("/results", response_model=List[Result])
-async def get_results():
-    results = await db.results.find().to_list(length=None)
-    return [Result(**parse_from_mongo(result)) for result in results]
+async def get_results(
+    request: Request,
+    festival: Festival,
+    limit: PageLimit = None,
+    cursor: Optional[str] = None,
+    stream: StreamFormat = None
+):
+    if limit is None and cursor is None and stream is None:
+        return await versioned_response(request, festival, ["results"], lambda: list_results(festival=festival))
+    if limit is None and not stream:
+        limit = DEFAULT_PAGE_LIMIT
+    return await paginate(store.results, Result, "created_at", limit, cursor, stream, {"festival_id": festival})
+
+@cached("teams")
+async def load_scoreboard(festival: str):
+    return await store.teams.find(
+        {"festival_id": festival},
+        {"_id": 0, "id": 1, "name": 1, "color": 1, "total_points": 1},
+        [("total_points", DESCENDING)]
+    )
 
 @api_router.get("/scoreboard")
-async def get_scoreboard():
-    teams = await db.teams.find().sort("total_points", -1).to_list(length=None)
-    return [{"id": team["id"], "name": team["name"], "color": team["color"], "total_points": team["total_points"]} for team in teams]
+async def get_scoreboard(request: Request, festival: Festival):
+    return await versioned_response(request, festival, ["teams"], lambda: load_scoreboard(festival=festival))
 
-@api_router.get("/individual-rankings")
-async def get_individual_rankings():
-    members = await db.members.find().to_list(length=None)
-    
-    adults = [m for m in members if m["category"] == "Adult"]
-    kids = [m for m in members if m["category"] == "Kid"]
+RANKING_CATEGORIES = {"adults": "Adult", "kids": "Kid"}
+RANKING_FIELDS = {"_id": 0, "id": 1, "name": 1, "category": 1, "team_id": 1, "individual_points": 1}
+
+async def assign_ranks(members, festival: str, category: str, offset: int):
+    """Competition ranking (1, 2, 2, 4): tied points share a rank."""
+    previous_points = None
+    rank = offset + 1
+    for position, member in enumerate(members):
+        points = member.get("individual_points", 0)
+        if points != previous_points:
+            if position == 0 and offset > 0:
+                # Ties may straddle the page boundary, so count who is strictly ahead
+                rank = await store.members.count(
+                    {"festival_id": festival, "category": category, "individual_points": {"$gt": points}}
+                ) + 1
+            else:
+                rank = offset + position + 1
+            previous_points = points
+        member["rank"] = rank
+    return members
+
+@cached("members")
+async def rank_members(festival: str, limit: Optional[int] = None, offset: int = 0, top: Optional[int] = None):
+    # top caps each category's ranking; offset/limit page within it
+    page_limit = limit
+    if top is not None:
+        page_limit = max(top - offset, 0) if limit is None else max(min(limit, top - offset), 0)
     
-    adults.sort(key=lambda x: x.get("individual_points", 0), reverse=True)
-    kids.sort(key=lambda x: x.get("individual_points", 0), reverse=True)
+    ranked = await store.rank_members(
+        RANKING_CATEGORIES, offset, page_limit, RANKING_FIELDS, match={"festival_id": festival}
+    )
     
+    rankings = {"totals": {}}
+    for key, category in RANKING_CATEGORIES.items():
+        rankings[key] = await assign_ranks(ranked[key], festival, category, offset)
+        rankings["totals"][key] = ranked[f"{key}_total"]
+    return rankings
+
+@api_router.get("/individual-rankings")
+async def get_individual_rankings(
+    request: Request,
+    festival: Festival,
+    limit: Annotated[Optional[int], Query(ge=1)] = None,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    top: Annotated[Optional[int], Query(ge=1)] = None
+):
+    return await versioned_response(
+        request, festival, ["members"], lambda: rank_members(festival=festival, limit=limit, offset=offset, top=top)
+    )
+
+@cached("teams", "members", "results", "events")
+async def load_team_stats(festival: str):
+    """Per-team member counts, individual points and placings, from one aggregation."""
+    stats = await store.team_stats({"festival_id": festival})
+    grand_total = sum(team.get("total_points", 0) for team in stats["teams"])
+    teams = []
+    for team in stats["teams"]:
+        members = {category: 0 for category in RANKING_CATEGORIES.values()}
+        individual_points = 0
+        for (team_id, category), (count, points) in stats["members"].items():
+            if team_id == team["id"]:
+                members[category] = members.get(category, 0) + count
+                individual_points += points
+        teams.append({
+            **team,
+            "members": {"total": sum(members.values()), **members},
+            "individual_points": individual_points,
+            "events_won": stats["placings"].get((team["id"], "winner"), 0),
+            "runner_up_finishes": stats["placings"].get((team["id"], "runner_up"), 0),
+            "share": round(team.get("total_points", 0) / grand_total, 4) if grand_total else 0
+        })
     return {
-        "adults": adults,
-        "kids": kids
+        "teams": teams,
+        "total_points": grand_total,
+        "total_members": sum(team["members"]["total"] for team in teams)
     }
 
+@api_router.get("/team-stats")
+async def get_team_stats(request: Request, festival: Festival):
+    return await versioned_response(
+        request, festival, ["teams", "members", "results", "events"], lambda: load_team_stats(festival=festival)
+    )
+
+@cached("points_config")
+async def load_points_config(festival: str):
+    # Festivals that never changed their config score with the defaults
+    projection, defaults = lean_shape(PointsConfig)
+    return {**defaults, **(await store.points_config.find_one({"festival_id": festival}, projection) or {})}
+
 @api_router.get("/points-config", response_model=PointsConfig)
-async def get_points_config():
-    config = await db.points_config.find_one({})
-    if not config:
-        return PointsConfig()
-    return PointsConfig(**config)
+async def get_points_config(request: Request, festival: Festival):
+    return await versioned_response(request, festival, ["points_config"], lambda: load_points_config(festival=festival))
+
+# Team totals over time; see advance_timeline for how the series is kept
+TIMELINE_PROJECTIONS = {
+    "event": {"_id": 0, "seq": 1, "at": 1, "result_id": 1, "event_id": 1, "event_name": 1, "totals": 1},
+    "hour": {"_id": 0, "at": 1, "results": 1, "totals": 1}
+}
+
+@cached("timeline")
+async def load_timeline(festival: str, bucket: str = "event"):
+    kind = "result" if bucket == "event" else "hour"
+    points = await store.timeline.find(
+        {"festival_id": festival, "kind": kind}, TIMELINE_PROJECTIONS[bucket], [("seq", ASCENDING)]
+    )
+    return {"bucket": bucket, "points": points}
+
+@api_router.get("/timeline")
+async def get_timeline(request: Request, festival: Festival, bucket: Literal["event", "hour"] = "event"):
+    """Team totals after each team result (bucket=event) or at the close of each hour (bucket=hour)."""
+    return await versioned_response(
+        request, festival, ["timeline"], lambda: load_timeline(festival=festival, bucket=bucket)
+    )
+
+# Dashboard snapshot: every public view in one round-trip
+DASHBOARD_SNAPSHOT_VERSION = 1
+DASHBOARD_SECTIONS = {
+    "teams": list_teams,
+    "members": list_members,
+    "events": list_events,
+    "results": list_results,
+    "scoreboard": load_scoreboard,
+    "individual_rankings": rank_members,
+    "points_config": load_points_config,
+    "timeline": load_timeline,
+    "team_stats": load_team_stats,
+}
+DASHBOARD_DEFAULT_SECTIONS = ["teams", "events", "scoreboard", "individual_rankings"]
+
+@api_router.get("/dashboard")
+async def get_dashboard(request: Request, festival: Festival, include: Optional[str] = None):
+    if include:
+        sections = [s.strip() for s in include.split(",") if s.strip()]
+        unknown = [s for s in sections if s not in DASHBOARD_SECTIONS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown dashboard sections: {', '.join(unknown)}")
+        sections = list(dict.fromkeys(sections))
+    else:
+        sections = DASHBOARD_DEFAULT_SECTIONS
+    
+    async def load_snapshot():
+        # The section loaders are independent, so their Mongo queries run concurrently
+        values = await asyncio.gather(*(DASHBOARD_SECTIONS[section](festival=festival) for section in sections))
+        
+        snapshot = {
+            "version": DASHBOARD_SNAPSHOT_VERSION,
+            "generated_at": datetime.now(timezone.utc).isoformat()
+        }
+        snapshot.update(zip(sections, values))
+        return snapshot
+    
+    collections = [collection for section in sections for collection in DASHBOARD_SECTIONS[section].collections]
+    return await versioned_response(request, festival, collections, load_snapshot)
+
+@api_router.get("/media/{key:path}")
+async def get_media(key: str, if_none_match: Optional[str] = Header(None)):
+    # Keys are content hashes, so the key itself is a strong validator
+    etag = f'"{Path(key).stem}"'
+    headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL, "ETag": etag}
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    stored = await media_store.get(key)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    data, content_type = stored
+    return Response(data, media_type=content_type, headers=headers)
+
+@api_router.get("/live")
+async def live_updates(
+    request: Request,
+    festival: Festival,
+    last_event_id: Optional[str] = None,
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    channel = live_channel(festival)
+    queue, backlog = channel.subscribe(last_event_id_header or last_event_id)
+    
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            for message in backlog:
+                yield message
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=LIVE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if message is None:
+                    break
+                yield message
+        finally:
+            channel.unsubscribe(queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Static snapshots: the public views as precompressed JSON files, rewritten after
+# every admin write, so nginx or a CDN can serve reads without this process
+# Layout under SNAPSHOT_DIR, one directory per festival:
+#   <festival>/<name>.json, .json.gz and .json.br (for gzip_static/brotli_static)
+#   <festival>/manifest.json with each file's content version; poll it, then
+#   fetch only the files whose version changed
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR')
+SNAPSHOT_DEBOUNCE_SECONDS = float(os.environ.get('SNAPSHOT_DEBOUNCE_SECONDS', '0.25'))
+SNAPSHOTS = {
+    "teams": list_teams,
+    "events": list_events,
+    "scoreboard": load_scoreboard,
+    "individual-rankings": rank_members,
+    "results": list_results
+}
+
+def write_atomically(path: Path, data: bytes):
+    # Readers see the old file or the new one, never a partial write
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+def write_snapshot(path: Path, body: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Compressed variants first, so the plain file never advertises a version they lack
+    write_atomically(path.with_name(path.name + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        write_atomically(path.with_name(path.name + ".br"), brotli.compress(body, quality=11))
+    write_atomically(path, body)
+
+class SnapshotPublisher:
+    """Republishes the snapshots a write affected, shortly after the write.
+
+    Writes arriving within debounce_seconds of each other are published together.
+    Loaders are called past the read cache, which is per process and may not
+    have seen another worker's writes.
+    """
+
+    def __init__(self, root, snapshots, debounce_seconds: float):
+        self.root = Path(root)
+        self.snapshots = snapshots
+        self.debounce_seconds = debounce_seconds
+        self._pending = {}
+        self._tasks = {}
+        # One publication per festival at a time: they share temporary files and the manifest
+        self._locks = {}
+        self.publications = 0
+
+    def notify(self, festival: str, collections):
+        names = {name for name, loader in self.snapshots.items() if set(loader.collections) & set(collections)}
+        if not names:
+            return
+        self._pending.setdefault(festival, set()).update(names)
+        if festival not in self._tasks:
+            try:
+                self._tasks[festival] = asyncio.get_running_loop().create_task(self._run(festival))
+            except RuntimeError:
+                # No event loop, e.g. a maintenance script; the next write catches up
+                self._pending.pop(festival, None)
+
+    async def _run(self, festival: str):
+        try:
+            while self._pending.get(festival):
+                await asyncio.sleep(self.debounce_seconds)
+                names = self._pending.pop(festival)
+                try:
+                    await self.publish(festival, names)
+                except Exception:
+                    logger.exception(f"Publishing snapshots for {festival} failed")
+        finally:
+            self._tasks.pop(festival, None)
+
+    async def drain(self):
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def publish(self, festival: str, names=None):
+        """Rewrite the named snapshots (all by default) whose content changed, then the manifest.
+
+        Waits for a publication of the same festival already under way, whether
+        debounced or forced, to finish first.
+        """
+        async with self._locks.setdefault(festival, asyncio.Lock()):
+            return await self._publish(festival, names)
+
+    async def _publish(self, festival: str, names):
+        directory = self.root / festival
+        manifest_path = directory / "manifest.json"
+        try:
+            manifest = orjson.loads(await asyncio.to_thread(manifest_path.read_bytes))
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            manifest = {"festival": festival, "sequence": 0, "files": {}}
+        
+        # A festival's first publication writes every file, whatever triggered it
+        names = set(names or self.snapshots) | (set(self.snapshots) - set(manifest["files"]))
+        changed = False
+        for name in sorted(names):
+            value = await self.snapshots[name].__wrapped__(festival=festival)
+            body = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+            version = hashlib.sha256(body).hexdigest()[:16]
+            if manifest["files"].get(name, {}).get("version") == version:
+                continue
+            await asyncio.to_thread(write_snapshot, directory / f"{name}.json", body)
+            manifest["files"][name] = {
+                "path": f"{name}.json",
+                "version": version,
+                "bytes": len(body),
+                "updated_at": datetime.now(timezone.utc).isoformat()
+            }
+            changed = True
+        
+        if changed:
+            manifest["sequence"] += 1
+            manifest["generated_at"] = datetime.now(timezone.utc).isoformat()
+            await asyncio.to_thread(write_snapshot, manifest_path, orjson.dumps(manifest))
+            self.publications += 1
+        return manifest
+
+snapshot_publisher = None
+if SNAPSHOT_DIR:
+    snapshot_publisher = SnapshotPublisher(SNAPSHOT_DIR, SNAPSHOTS, SNAPSHOT_DEBOUNCE_SECONDS)
+    read_cache.listeners.append(snapshot_publisher.notify)
+
+@app.on_event("startup")
+async def publish_snapshots():
+    # Catch up on writes made while no publisher was running
+    if snapshot_publisher is None:
+        return
+    festivals = {team["festival_id"] async for team in store.teams.iterate({}, {"_id": 0, "festival_id": 1})}
+    for festival in sorted(festivals | {DEFAULT_FESTIVAL}):
+        snapshot_publisher.notify(festival, list(store.COLLECTIONS))
 
 # Admin-only endpoints
 @api_router.post("/teams", response_model=Team)
-async def create_team(team_data: Team, current_admin: str = Depends(get_current_admin)):
+async def create_team(team_data: Team, festival: Festival, current_admin: str = Depends(get_current_admin)):
+    team_data.festival_id = festival
     team_dict = prepare_for_mongo(team_data.dict())
-    await db.teams.insert_one(team_dict)
+    await store.teams.insert_one(team_dict)
+    await read_cache.invalidate(festival, "teams")
     return team_data
 
+# Team logos: resized on upload and stored under content-hash keys, so every
+# logo URL is immutable and cacheable forever
+LOGO_SIZES = sorted(int(size) for size in os.environ.get('LOGO_SIZES', '64,128,256').split(','))
+LOGO_MAX_BYTES = int(os.environ.get('LOGO_MAX_BYTES', str(5 * 1024 * 1024)))
+LOGO_MAX_PIXELS = int(os.environ.get('LOGO_MAX_PIXELS', str(25_000_000)))
+
+@api_router.put("/teams/{team_id}/logo", response_model=Team)
+async def upload_team_logo(
+    team_id: str,
+    request: Request,
+    festival: Festival,
+    current_admin: str = Depends(get_current_admin)
+):
+    """Upload the raw image bytes as the body, e.g. with Content-Type: image/png."""
+    if not await store.teams.find_one({"id": team_id, "festival_id": festival}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Team not found")
+    
+    data = bytearray()
+    async for chunk in request.stream():
+        data += chunk
+        if len(data) > LOGO_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Logos are limited to {LOGO_MAX_BYTES} bytes")
+    try:
+        thumbnails = await asyncio.to_thread(render_thumbnails, bytes(data), LOGO_SIZES, LOGO_MAX_PIXELS)
+    except ImportError:
+        raise HTTPException(status_code=501, detail="Logo uploads need Pillow installed")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    
+    logo_urls = {}
+    for size, thumbnail in thumbnails.items():
+        key = content_key("logos", thumbnail, ".webp")
+        # A logo uploaded before, by any team, is already stored
+        if not await media_store.exists(key):
+            await media_store.put(key, thumbnail, "image/webp")
+        logo_urls[str(size)] = media_store.url(key)
+    
+    # One document update switches every URL at once, after all the files exist
+    team = await store.teams.find_one_and_update(
+        {"id": team_id, "festival_id": festival},
+        {"$set": {"logo_url": logo_urls[str(LOGO_SIZES[-1])], "logo_urls": logo_urls}}
+    )
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+    await read_cache.invalidate(festival, "teams")
+    team.update(logo_url=logo_urls[str(LOGO_SIZES[-1])], logo_urls=logo_urls)
+    return Team(**parse_from_mongo(team))
+
 @api_router.post("/members", response_model=Member)
-async def create_member(member_data: Member, current_admin: str = Depends(get_current_admin)):
+async def create_member(member_data: Member, festival: Festival, current_admin: str = Depends(get_current_admin)):
+    member_data.festival_id = festival
     member_dict = prepare_for_mongo(member_data.dict())
-    await db.members.insert_one(member_dict)
+    member_dict["name_key"] = search_key(member_data.name)
+    await store.members.insert_one(member_dict)
+    await read_cache.invalidate(festival, "members")
     return member_data
 
 @api_router.delete("/members/{member_id}")
-async def delete_member(member_id: str, current_admin: str = Depends(get_current_admin)):
-    result = await db.members.delete_one({"id": member_id})
-    if result.deleted_count == 0:
+async def delete_member(member_id: str, festival: Festival, current_admin: str = Depends(get_current_admin)):
+    if await store.members.delete_one({"id": member_id, "festival_id": festival}) == 0:
         raise HTTPException(status_code=404, detail="Member not found")
+    await read_cache.invalidate(festival, "members")
     return {"message": "Member deleted successfully"}
 
 @api_router.post("/events", response_model=Event)
-async def create_event(event_data: Event, current_admin: str = Depends(get_current_admin)):
+async def create_event(event_data: Event, festival: Festival, current_admin: str = Depends(get_current_admin)):
+    event_data.festival_id = festival
     event_dict = prepare_for_mongo(event_data.dict())
-    await db.events.insert_one(event_dict)
+    await store.events.insert_one(event_dict)
+    await read_cache.invalidate(festival, "events")
     return event_data
 
 @api_router.put("/events/{event_id}", response_model=Event)
-async def update_event(event_id: str, event_data: Event, current_admin: str = Depends(get_current_admin)):
+async def update_event(
+    event_id: str,
+    event_data: Event,
+    festival: Festival,
+    current_admin: str = Depends(get_current_admin)
+):
+    event_data.festival_id = festival
     event_dict = prepare_for_mongo(event_data.dict())
-    result = await db.events.replace_one({"id": event_id}, event_dict)
-    if result.matched_count == 0:
+    if await store.events.replace_one({"id": event_id, "festival_id": festival}, event_dict) == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    await read_cache.invalidate(festival, "events")
+    live_channel(festival).publish("event", event_data)
     return event_data
 
 @api_router.delete("/events/{event_id}")
-async def delete_event(event_id: str, current_admin: str = Depends(get_current_admin)):
-    result = await db.events.delete_one({"id": event_id})
-    if result.deleted_count == 0:
+async def delete_event(event_id: str, festival: Festival, current_admin: str = Depends(get_current_admin)):
+    if await store.events.delete_one({"id": event_id, "festival_id": festival}) == 0:
         raise HTTPException(status_code=404, detail="Event not found")
+    await read_cache.invalidate(festival, "events")
+    # Points awarded for this event stop counting
+    await reconcile_scores(results_match={"event_id": event_id})
+    await rebuild_timeline(festival)
     return {"message": "Event deleted successfully"}
 
-@api_router.post("/results", response_model=Result)
-async def create_result(result_data: Result, current_admin: str = Depends(get_current_admin)):
-    # Update points based on event type
-    event = await db.events.find_one({"id": result_data.event_id})
+# Result recording
+def result_increments(event_type: str, result_data: Result):
+    """Point increments for a result, combined per team or member."""
+    if event_type == "Team":
+        collection, field = "teams", "total_points"
+        placings = [
+            (result_data.winner_team_id, result_data.winner_points),
+            (result_data.runner_up_team_id, result_data.runner_up_points)
+        ]
+    else:
+        collection, field = "members", "individual_points"
+        placings = [
+            (result_data.winner_member_id, result_data.winner_points),
+            (result_data.runner_up_member_id, result_data.runner_up_points)
+        ]
+    increments = {}
+    for entity_id, points in placings:
+        if entity_id:
+            increments[entity_id] = increments.get(entity_id, 0) + points
+    return collection, field, increments
+
+async def apply_increments(festival: str, increments_by_collection, session=None):
+    """Add points with one ordered bulk $inc per collection.
+
+    Inside a transaction (session given) a failure aborts everything. Without
+    one, the increments that ran before the failure are undone before the
+    error propagates.
+    """
+    applied = []
+    try:
+        for collection, increments in increments_by_collection.items():
+            if not increments:
+                continue
+            operations = list(increments.items())
+            try:
+                # Teams and members of other festivals never score
+                await store[collection].bulk_update([
+                    ({"id": entity_id, "festival_id": festival}, {"$inc": {SCORE_COUNTERS[collection]: points}})
+                    for entity_id, points in operations
+                ], ordered=True, session=session)
+            except BulkWriteError as e:
+                # An ordered bulk write stops at the first error; the ones before it ran
+                applied.append((collection, operations[:e.details["writeErrors"][0]["index"]]))
+                raise
+            applied.append((collection, operations))
+    except PyMongoError:
+        if session is None:
+            for collection, operations in applied:
+                await store[collection].bulk_update([
+                    ({"id": entity_id, "festival_id": festival}, {"$inc": {SCORE_COUNTERS[collection]: -points}})
+                    for entity_id, points in operations
+                ])
+        raise
+
+async def record_result(result_data: Result, idempotency_key: Optional[str] = None, session=None):
+    """Claim the event, store the result and apply its points.
+
+    Inside a transaction (session given) a failure aborts everything. Without
+    one, the steps already taken are undone before the error propagates.
+    Returns the event, or None if it is missing or already has a result.
+    """
+    # Claiming the event atomically is what serializes concurrent admins
+    festival = result_data.festival_id
+    event = await store.events.find_one_and_update(
+        {"id": result_data.event_id, "festival_id": festival, "is_completed": {"$ne": True}},
+        {"$set": {"is_completed": True}},
+        session=session
+    )
     if not event:
-        raise HTTPException(status_code=404, detail="Event not found")
+        return None
     
-    if event["event_type"] == "Team":
-        # Update team points
-        if result_data.winner_team_id:
-            await db.teams.update_one(
-                {"id": result_data.winner_team_id},
-                {"$inc": {"total_points": result_data.winner_points}}
+    async def release_event():
+        if session is None:
+            await store.events.update_one(
+                {"id": result_data.event_id, "festival_id": festival}, {"$set": {"is_completed": False}}
             )
-        
-        if result_data.runner_up_team_id:
-            await db.teams.update_one(
-                {"id": result_data.runner_up_team_id},
-                {"$inc": {"total_points": result_data.runner_up_points}}
+    
+    result_dict = prepare_for_mongo(result_data.dict())
+    # created_at may come from the client; reconciliation goes by when the server stored it
+    result_dict["recorded_at"] = datetime.now(timezone.utc).isoformat()
+    if idempotency_key:
+        result_dict["idempotency_key"] = idempotency_key
+    if session is None:
+        # Reconciliation leaves this result's entities alone until its points are in
+        result_dict[POINTS_PENDING] = result_dict["recorded_at"]
+    try:
+        await store.results.insert_one(result_dict, session=session)
+    except DuplicateKeyError:
+        await release_event()
+        raise
+    
+    collection, _, increments = result_increments(event["event_type"], result_data)
+    try:
+        await apply_increments(festival, {collection: increments}, session=session)
+    except PyMongoError:
+        if session is None:
+            await store.results.delete_one({"id": result_data.id})
+            await release_event()
+        raise
+    if session is None:
+        await store.results.update_one({"id": result_data.id}, {"$unset": {POINTS_PENDING: ""}})
+    return event
+
+@api_router.post("/results", response_model=Result)
+async def create_result(
+    result_data: Result,
+    festival: Festival,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    current_admin: str = Depends(get_current_admin)
+):
+    result_data.festival_id = festival
+    try:
+        if await store.transactions_supported():
+            event = await store.run_in_transaction(
+                lambda session: record_result(result_data, idempotency_key, session)
             )
-    else:
-        # Update individual member points
-        if result_data.winner_member_id:
-            await db.members.update_one(
-                {"id": result_data.winner_member_id},
-                {"$inc": {"individual_points": result_data.winner_points}}
+        else:
+            event = await record_result(result_data, idempotency_key)
+    except DuplicateKeyError:
+        event = None
+    
+    if event is None:
+        # A retried request gets the result it already created
+        if idempotency_key:
+            existing = await store.results.find_one(
+                {"idempotency_key": idempotency_key, "festival_id": festival}, {"_id": 0}
             )
+            if existing:
+                return Result(**parse_from_mongo(existing))
+        if not await store.events.find_one({"id": result_data.event_id, "festival_id": festival}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Event not found")
+        raise HTTPException(status_code=409, detail="A result has already been recorded for this event")
+    
+    await read_cache.invalidate(festival, "teams", "members", "events", "results")
+    
+    collection, _, increments = result_increments(event["event_type"], result_data)
+    deltas = {"teams": {}, "members": {}}
+    deltas[collection] = increments
+    timeline_point = None
+    if collection == "teams" and increments:
+        timeline_point = await advance_timeline(festival, result_data, event, increments)
+    live_channel(festival).publish("result", {
+        "result": result_data,
+        "deltas": deltas,
+        "scoreboard": await load_scoreboard(festival=festival),
+        "timeline": timeline_point
+    })
+    return result_data
+
+# Batch result recording: a block of games entered in one request
+# The whole batch costs a fixed number of queries: one to validate the events,
+# one claim, one insert and one combined bulk write per scored collection.
+RESULT_BATCH_MAX = int(os.environ.get('RESULT_BATCH_MAX', '100'))
+
+@api_router.post("/results/batch")
+async def create_results_batch(
+    results: List[Result],
+    festival: Festival,
+    current_admin: str = Depends(get_current_admin)
+):
+    if not results:
+        raise HTTPException(status_code=400, detail="No results given")
+    if len(results) > RESULT_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {RESULT_BATCH_MAX} results per batch")
+    
+    outcomes = [{"index": index, "event_id": result_data.event_id} for index, result_data in enumerate(results)]
+    conflict = "A result has already been recorded for this event"
+    events = {
+        event["id"]: event
+        for event in await store.events.find(
+            {"id": {"$in": list({result_data.event_id for result_data in results})}, "festival_id": festival},
+            {"_id": 0, "id": 1, "name": 1, "event_type": 1, "is_completed": 1}
+        )
+    }
+    pending = {}
+    for outcome, result_data in zip(outcomes, results):
+        result_data.festival_id = festival
+        event = events.get(result_data.event_id)
+        if event is None:
+            outcome.update(status="not_found", detail="Event not found")
+        elif event.get("is_completed") or result_data.event_id in pending:
+            outcome.update(status="conflict", detail=conflict)
+        else:
+            pending[result_data.event_id] = outcome["index"]
+    
+    if pending:
+        # Claim every event at once; the token tells this batch's claims apart
+        # from those of an admin recording one of the same events concurrently
+        claim = str(uuid.uuid4())
+        event_ids = list(pending)
+        claimed = await store.events.update_many(
+            {"id": {"$in": event_ids}, "festival_id": festival, "is_completed": {"$ne": True}},
+            {"$set": {"is_completed": True, "result_claim": claim}}
+        )
+        if claimed < len(pending):
+            ours = {
+                event["id"]
+                for event in await store.events.find({"id": {"$in": event_ids}, "result_claim": claim}, {"_id": 0, "id": 1})
+            }
+            for event_id in event_ids:
+                if event_id not in ours:
+                    outcomes[pending.pop(event_id)].update(status="conflict", detail=conflict)
+        await store.events.update_many({"id": {"$in": event_ids}, "result_claim": claim}, {"$unset": {"result_claim": ""}})
+    
+    if pending:
+        indexes = list(pending.values())
+        recorded_at = datetime.now(timezone.utc).isoformat()
+        inserted, errors = await store.results.insert_many([
+            {**prepare_for_mongo(results[index].dict()), "recorded_at": recorded_at, POINTS_PENDING: recorded_at}
+            for index in indexes
+        ])
+        if errors:
+            failed = [results[indexes[position]].event_id for position, _ in errors]
+            await store.events.update_many(
+                {"id": {"$in": failed}, "festival_id": festival}, {"$set": {"is_completed": False}}
+            )
+            for position, message in errors:
+                outcomes[indexes[position]].update(
+                    status="conflict", detail=conflict if "event_id" in message else message
+                )
+                pending.pop(results[indexes[position]].event_id)
+    
+    created = [results[index] for index in pending.values()]
+    deltas = {"teams": {}, "members": {}}
+    timeline_entries = []
+    for result_data in created:
+        event = events[result_data.event_id]
+        collection, _, increments = result_increments(event["event_type"], result_data)
+        for entity_id, points in increments.items():
+            deltas[collection][entity_id] = deltas[collection].get(entity_id, 0) + points
+        if collection == "teams" and increments:
+            timeline_entries.append((result_data, event, increments))
+    
+    if created:
+        try:
+            await apply_increments(festival, deltas)
+        except PyMongoError:
+            await store.results.delete_many({"id": {"$in": [result_data.id for result_data in created]}})
+            await store.events.update_many(
+                {"id": {"$in": list(pending)}, "festival_id": festival}, {"$set": {"is_completed": False}}
+            )
+            raise
+        await store.results.update_many(
+            {"id": {"$in": [result_data.id for result_data in created]}}, {"$unset": {POINTS_PENDING: ""}}
+        )
+        for result_data in created:
+            outcomes[pending[result_data.event_id]].update(status="created", result=result_data)
         
-        if result_data.runner_up_member_id:
-            await db.members.update_one(
-                {"id": result_data.runner_up_member_id},
-                {"$inc": {"individual_points": result_data.runner_up_points}}
+        await read_cache.invalidate(festival, "teams", "members", "events", "results")
+        timeline_points = await extend_timeline(festival, timeline_entries) if timeline_entries else []
+        live_channel(festival).publish("results", {
+            "results": created,
+            "deltas": deltas,
+            "scoreboard": await load_scoreboard(festival=festival),
+            "timeline": timeline_points
+        })
+    
+    return {"created": len(created), "results": outcomes}
+
+# Score timeline: cumulative team totals after every team result, for charts
+# A running-totals document per festival is bumped atomically, so each point
+# holds exactly the totals after its own result, however writes interleave.
+# Extending and rebuilding a festival's timeline take its lock in turn: a
+# rebuild replaces the running totals, and an extension must neither land in
+# the middle of that nor repeat a result the rebuild already replayed.
+TIMELINE_LOCK_SECONDS = float(os.environ.get('TIMELINE_LOCK_SECONDS', '30'))
+
+@asynccontextmanager
+async def timeline_lock(festival: str):
+    """Hold the festival's timeline lock, shared by every worker through the database.
+
+    A lock left by a crashed holder expires after TIMELINE_LOCK_SECONDS.
+    """
+    lock_id, token = f"{festival}:lock", uuid.uuid4().hex
+    while True:
+        try:
+            await store.timeline.insert_one({
+                "_id": lock_id,
+                "festival_id": festival,
+                "kind": "lock",
+                "seq": 0,
+                "token": token,
+                "expires_at": time.time() + TIMELINE_LOCK_SECONDS
+            })
+            break
+        except DuplicateKeyError:
+            await store.timeline.delete_one({"_id": lock_id, "expires_at": {"$lt": time.time()}})
+            await asyncio.sleep(0.02)
+    try:
+        yield
+    finally:
+        await store.timeline.delete_one({"_id": lock_id, "token": token})
+
+def timeline_hour(recorded_at: datetime):
+    """Hour bucket number and its start time."""
+    hour = int(recorded_at.timestamp() // 3600)
+    return hour, datetime.fromtimestamp(hour * 3600, timezone.utc).isoformat()
+
+async def advance_timeline(festival: str, result_data: Result, event, increments):
+    [point] = await extend_timeline(festival, [(result_data, event, increments)])
+    return point
+
+async def extend_timeline(festival: str, entries):
+    """Append a point per (result, event, increments) entry, in order, with one bump of the running totals.
+
+    Results a concurrent rebuild already replayed are left out. Returns the new points.
+    """
+    async with timeline_lock(festival):
+        present = {
+            point["result_id"]
+            for point in await store.timeline.find(
+                {"festival_id": festival, "result_id": {"$in": [result_data.id for result_data, _, _ in entries]}},
+                {"_id": 0, "result_id": 1}
             )
+        }
+        entries = [entry for entry in entries if entry[0].id not in present]
+        points = await append_timeline_points(festival, entries) if entries else []
+    await read_cache.invalidate(festival, "timeline")
+    return points
+
+async def append_timeline_points(festival: str, entries):
+    combined = {}
+    for _, _, increments in entries:
+        for team_id, points in increments.items():
+            combined[team_id] = combined.get(team_id, 0) + points
+    before = await store.timeline.find_one_and_update(
+        {"_id": f"{festival}:totals"},
+        {
+            "$inc": {"seq": len(entries), **{f"totals.{team_id}": points for team_id, points in combined.items()}},
+            "$setOnInsert": {"festival_id": festival, "kind": "totals"}
+        },
+        upsert=True
+    ) or {}
+    seq = before.get("seq", 0)
+    totals = dict(before.get("totals", {}))
+    
+    points, hours = [], {}
+    for result_data, event, increments in entries:
+        seq += 1
+        for team_id, points_awarded in increments.items():
+            totals[team_id] = totals.get(team_id, 0) + points_awarded
+        point = {
+            "seq": seq,
+            "at": result_data.created_at.isoformat(),
+            "result_id": result_data.id,
+            "event_id": event["id"],
+            "event_name": event.get("name"),
+            "totals": dict(totals)
+        }
+        points.append(point)
+        hour, hour_start = timeline_hour(result_data.created_at)
+        count = hours[hour][2] + 1 if hour in hours else 1
+        hours[hour] = (hour_start, point, count)
+    _, errors = await store.timeline.insert_many([{**point, "festival_id": festival, "kind": "result"} for point in points])
+    if errors:
+        raise RuntimeError(f"Timeline points for {festival} were not stored: {errors[0][1]}")
     
-    # Mark event as completed
-    await db.events.update_one(
-        {"id": result_data.event_id},
-        {"$set": {"is_completed": True}}
+    for hour, (hour_start, point, count) in hours.items():
+        bucket = {"festival_id": festival, "kind": "hour", "seq": hour}
+        try:
+            # Only a later result may replace the totals the hour closed on
+            await store.timeline.update_one(
+                {**bucket, "last_seq": {"$lt": point["seq"]}},
+                {"$set": {"at": hour_start, "last_seq": point["seq"], "totals": point["totals"]}, "$inc": {"results": count}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            await store.timeline.update_one(bucket, {"$inc": {"results": count}})
+    return points
+
+async def rebuild_timeline(festival: str):
+    """Replay a festival's team results into a fresh timeline, e.g. after points changed retroactively."""
+    async with timeline_lock(festival):
+        seq = await replay_timeline(festival)
+    await read_cache.invalidate(festival, "timeline")
+    return seq
+
+async def replay_timeline(festival: str):
+    team_events = {
+        event["id"]: event
+        for event in await store.events.find({"festival_id": festival, "event_type": "Team"}, {"_id": 0, "id": 1, "name": 1})
+    }
+    totals, seq = {}, 0
+    documents, hours = [], {}
+    results = store.results.iterate(
+        {"festival_id": festival}, {"_id": 0}, [("created_at", ASCENDING), ("id", ASCENDING)]
     )
+    async for result in results:
+        event = team_events.get(result["event_id"])
+        if event is None:
+            continue
+        result_data = Result(**parse_from_mongo(result))
+        _, _, increments = result_increments("Team", result_data)
+        if not increments:
+            continue
+        seq += 1
+        for team_id, points in increments.items():
+            totals[team_id] = totals.get(team_id, 0) + points
+        documents.append({
+            "festival_id": festival,
+            "kind": "result",
+            "seq": seq,
+            "at": result_data.created_at.isoformat(),
+            "result_id": result_data.id,
+            "event_id": event["id"],
+            "event_name": event.get("name"),
+            "totals": dict(totals)
+        })
+        hour, hour_start = timeline_hour(result_data.created_at)
+        hours[hour] = {
+            "festival_id": festival,
+            "kind": "hour",
+            "seq": hour,
+            "at": hour_start,
+            "last_seq": seq,
+            "totals": dict(totals),
+            "results": hours[hour]["results"] + 1 if hour in hours else 1
+        }
+    documents += hours.values()
+    documents.append({"_id": f"{festival}:totals", "festival_id": festival, "kind": "totals", "seq": seq, "totals": totals})
     
-    result_dict = prepare_for_mongo(result_data.dict())
-    await db.results.insert_one(result_dict)
-    return result_data
+    await store.timeline.delete_many({"festival_id": festival, "kind": {"$ne": "lock"}})
+    _, errors = await store.timeline.insert_many(documents)
+    if errors:
+        raise RuntimeError(f"Timeline for {festival} was not rebuilt: {errors[0][1]}")
+    return seq
+
+
+# Score reconciliation: rebuild the denormalized totals from the results collection
+SCORE_COUNTERS = {"teams": "total_points", "members": "individual_points"}
+PLACING_FIELDS = ["winner_team_id", "runner_up_team_id", "winner_member_id", "runner_up_member_id"]
+# Without transactions a result is stored before its points are applied, and
+# carries this timestamp until they are. A marker older than the timeout is
+# left by a crashed request, and its result counts like any other.
+POINTS_PENDING = "points_pending_since"
+POINTS_PENDING_TIMEOUT_SECONDS = int(os.environ.get('POINTS_PENDING_TIMEOUT_SECONDS', '300'))
+# The watermark is a recorded_at time, stamped by whichever worker stored the
+# result, and a result can be stamped just before a run but stored just after
+# it. Incremental runs therefore look back this far past the watermark.
+RECONCILE_OVERLAP_SECONDS = int(os.environ.get('RECONCILE_OVERLAP_SECONDS', '60'))
+
+async def reconcile_scores(
+    full: bool = False,
+    dry_run: bool = False,
+    results_match: Optional[dict] = None,
+    festival: Optional[str] = None
+):
+    """Correct team and member totals that have drifted from their results.
+
+    A routine run only re-totals the teams and members named in results stored
+    since the last watermark. A full run re-totals everyone, which also catches
+    drift from deleted events and edited results. results_match narrows the
+    scope to the entities named in the matching results instead, and festival
+    limits a full run to one festival. Only unscoped runs move the watermark,
+    and never past a result whose points were still being applied.
+    """
+    advance_watermark = results_match is None and festival is None
+    state = await store.reconciliation.find_one({"_id": "watermark"}) or {}
+    in_flight_after = (datetime.now(timezone.utc) - timedelta(seconds=POINTS_PENDING_TIMEOUT_SECONDS)).isoformat()
+    latest = await store.results.find(
+        {"recorded_at": {"$exists": True}}, {"_id": 0, "recorded_at": 1}, sort=[("recorded_at", DESCENDING)], limit=1
+    )
+    # Entities of in-flight results are skipped below, so their results must be looked at again
+    in_flight = await store.results.find(
+        {POINTS_PENDING: {"$gt": in_flight_after}}, {"_id": 0, "recorded_at": 1}, sort=[(POINTS_PENDING, ASCENDING)], limit=1
+    )
+    watermark = min(result["recorded_at"] for result in latest + in_flight) if latest else None
+    
+    # Watermarks from before recorded_at existed start over with a full run
+    if advance_watermark and not full and state.get("recorded_at"):
+        since = datetime.fromisoformat(state["recorded_at"]) - timedelta(seconds=RECONCILE_OVERLAP_SECONDS)
+        results_match = {"recorded_at": {"$gte": since.isoformat()}}
+    full = results_match is None
+    
+    scope = None
+    if not full:
+        scope = {"teams": set(), "members": set()}
+        async for result in store.results.iterate(results_match, {"_id": 0, **{f: 1 for f in PLACING_FIELDS}}):
+            for field in PLACING_FIELDS:
+                if result.get(field):
+                    scope["teams" if "team" in field else "members"].add(result[field])
+    
+    # Counters are read before the results, so a result stored after the totals
+    # are summed has its $inc either before the counters were read or after:
+    # the compare-and-set skips the latter.
+    counters = {}
+    for collection, field in SCORE_COUNTERS.items():
+        query = {} if full else {"id": {"$in": list(scope[collection])}}
+        if full and festival is not None:
+            query = {"festival_id": festival}
+        if not full and not scope[collection]:
+            continue
+        counters[collection] = await store[collection].find(query, {"_id": 0, "id": 1, "festival_id": 1, "name": 1, field: 1})
+    
+    totals = {}
+    if full or scope["teams"] or scope["members"]:
+        match = None if festival is None else {"festival_id": festival}
+        if not full:
+            match = {"$or": [
+                {field: {"$in": list(scope["teams" if "team" in field else "members"])}}
+                for field in PLACING_FIELDS
+            ]}
+        totals = await store.score_totals(match, in_flight_after)
+    
+    report = {"mode": "full" if full else "incremental", "dry_run": dry_run, "checked": 0, "corrections": [], "skipped": 0}
+    for collection, documents in counters.items():
+        field = SCORE_COUNTERS[collection]
+        operations = []
+        for document in documents:
+            report["checked"] += 1
+            current = document.get(field)
+            expected = totals.get((collection, document["id"]), 0)
+            if expected is None:
+                # A result naming it is still having its points applied
+                report["skipped"] += 1
+                continue
+            if current == expected:
+                continue
+            report["corrections"].append({
+                "collection": collection,
+                "festival_id": document.get("festival_id"),
+                "id": document["id"],
+                "name": document.get("name"),
+                "before": current,
+                "after": expected
+            })
+            # Compare-and-set: a counter that moved since it was read is skipped, not overwritten
+            operations.append(({"id": document["id"], field: current}, {"$set": {field: expected}}))
+        if operations and not dry_run:
+            matched = await store[collection].bulk_update(operations, ordered=False)
+            report["skipped"] += len(operations) - matched
+    
+    if not dry_run:
+        if watermark and advance_watermark:
+            await store.reconciliation.replace_one({"_id": "watermark"}, {"recorded_at": watermark}, upsert=True)
+        corrected = {}
+        for correction in report["corrections"]:
+            corrected.setdefault(correction["festival_id"], []).append(correction)
+        for corrected_festival, corrections in corrected.items():
+            await read_cache.invalidate(corrected_festival, "teams", "members")
+            live_channel(corrected_festival).publish("reconciled", {
+                "corrections": corrections,
+                "scoreboard": await load_scoreboard(festival=corrected_festival)
+            })
+    if report["corrections"]:
+        logger.info(f"Score reconciliation ({report['mode']}) corrected {len(report['corrections'])} totals")
+    return report
+
+async def reapply_points_config(festival: str, previous, config_data: PointsConfig):
+    """Move a festival's recorded results from the previous config to the given one, then re-total.
+
+    Only points equal to the previous config's are rewritten; points an admin
+    entered by hand for a result are kept.
+    """
+    for field in ("winner_points", "runner_up_points"):
+        if previous[field] != getattr(config_data, field):
+            await store.results.update_many(
+                {"festival_id": festival, field: previous[field]}, {"$set": {field: getattr(config_data, field)}}
+            )
+    await read_cache.invalidate(festival, "results")
+    report = await reconcile_scores(full=True, festival=festival)
+    await rebuild_timeline(festival)
+    return report
 
 @api_router.put("/points-config", response_model=PointsConfig)
-async def update_points_config(config_data: PointsConfig, current_admin: str = Depends(get_current_admin)):
-    await db.points_config.replace_one({}, config_data.dict(), upsert=True)
+async def update_points_config(
+    config_data: PointsConfig,
+    festival: Festival,
+    retroactive: bool = False,
+    current_admin: str = Depends(get_current_admin)
+):
+    previous = await load_points_config.__wrapped__(festival=festival)
+    await store.points_config.replace_one(
+        {"festival_id": festival}, {**config_data.dict(), "festival_id": festival}, upsert=True
+    )
+    await read_cache.invalidate(festival, "points_config")
+    live_channel(festival).publish("points_config", config_data)
+    if retroactive:
+        await reapply_points_config(festival, previous, config_data)
     return config_data
 
+@api_router.post("/admin/reconcile")
+async def reconcile(full: bool = False, dry_run: bool = False, current_admin: str = Depends(get_deployment_admin)):
+    return await reconcile_scores(full=full, dry_run=dry_run)
+
+# Bulk import of teams, members and events from a streamed CSV or NDJSON body
+IMPORT_MODELS = {"teams": Team, "members": Member, "events": Event}
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '500'))
+
+def csv_in_quotes(line: str, quoted: bool = False) -> bool:
+    """Whether a CSV record is still inside a quoted field at the end of line.
+
+    quoted is the state the line starts in. As csv.reader reads it, a quote
+    opens a quoted field only at the start of a field; elsewhere it is a
+    literal character, and inside a quoted field "" is an escaped quote.
+    """
+    field_start = not quoted
+    position = 0
+    while position < len(line):
+        char = line[position]
+        if quoted:
+            if char == '"':
+                if line[position + 1:position + 2] == '"':
+                    position += 1
+                else:
+                    quoted = False
+        elif char == '"' and field_start:
+            quoted = True
+        field_start = char == "," and not quoted
+        position += 1
+    return quoted
+
+async def iter_upload_records(request: Request, file_format: str):
+    """Yield one dict per row (or the ValueError that row raised) as the body streams in."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    header = None
+    pending = ""
+    quoted = False
+    
+    async def lines():
+        nonlocal buffer
+        async for chunk in request.stream():
+            buffer += decoder.decode(chunk)
+            *complete, buffer = buffer.split("\n")
+            for line in complete:
+                yield line
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer
+    
+    async for line in lines():
+        if file_format == "ndjson":
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("Expected a JSON object")
+                yield record
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+            continue
+        
+        # A quoted CSV field may span lines; wait until it closes
+        pending = f"{pending}\n{line}" if pending else line
+        quoted = csv_in_quotes(line, quoted)
+        if quoted:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        row = next(csv.reader([record]))
+        if header is None:
+            header = [column.strip() for column in row]
+            continue
+        if len(row) != len(header):
+            yield ValueError(f"Expected {len(header)} columns, got {len(row)}")
+            continue
+        # Empty cells fall back to the model defaults
+        yield {column: value for column, value in zip(header, row) if value != ""}
+    if pending:
+        yield ValueError("Unterminated quoted field")
+
+async def import_batch(kind: str, festival: str, batch, report, team_ids=None):
+    documents = []
+    for row_number, record in batch:
+        if isinstance(record, ValueError):
+            report["errors"].append({"row": row_number, "errors": [str(record)]})
+            continue
+        if kind == "members" and "team_id" not in record and "team" in record:
+            # Rosters are usually written with team names, not ids
+            if record["team"] not in team_ids:
+                report["errors"].append({"row": row_number, "errors": [f"team: Unknown team {record['team']}"]})
+                continue
+            record["team_id"] = team_ids[record.pop("team")]
+        try:
+            model = IMPORT_MODELS[kind](**record)
+        except ValidationError as e:
+            report["errors"].append({
+                "row": row_number,
+                "errors": [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+            })
+            continue
+        if kind == "members" and model.team_id not in team_ids.values():
+            report["errors"].append({"row": row_number, "errors": [f"team_id: Unknown team {model.team_id}"]})
+            continue
+        model.festival_id = festival
+        document = prepare_for_mongo(model.dict())
+        if kind == "members":
+            document["name_key"] = search_key(model.name)
+        documents.append((row_number, document))
+    
+    if not documents:
+        return
+    # Unordered inserts carry on past failures; report the rows that failed
+    inserted, errors = await store[kind].insert_many([document for _, document in documents])
+    report["inserted"] += inserted
+    for index, message in errors:
+        report["errors"].append({"row": documents[index][0], "errors": [message]})
+
+@api_router.post("/import/{kind}")
+async def bulk_import(
+    kind: Literal["teams", "members", "events"],
+    request: Request,
+    festival: Festival,
+    format: Optional[Literal["csv", "ndjson"]] = None,
+    current_admin: str = Depends(get_current_admin)
+):
+    file_format = format
+    if file_format is None:
+        content_type = request.headers.get("content-type", "")
+        if "csv" in content_type:
+            file_format = "csv"
+        elif "ndjson" in content_type or "jsonl" in content_type:
+            file_format = "ndjson"
+        else:
+            raise HTTPException(status_code=415, detail="Upload text/csv or application/x-ndjson, or pass format=")
+    
+    team_ids = None
+    if kind == "members":
+        teams = store.teams.iterate({"festival_id": festival}, {"_id": 0, "id": 1, "name": 1})
+        team_ids = {team["name"]: team["id"] async for team in teams}
+    
+    report = {"kind": kind, "festival_id": festival, "received": 0, "inserted": 0, "errors": []}
+    batch = []
+    async for record in iter_upload_records(request, file_format):
+        report["received"] += 1
+        batch.append((report["received"], record))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await import_batch(kind, festival, batch, report, team_ids)
+            batch = []
+    await import_batch(kind, festival, batch, report, team_ids)
+    
+    if report["inserted"]:
+        await read_cache.invalidate(festival, kind)
+    return report
+
+# Exports: certificate lists and prize sheets, joined server-side and streamed in chunks
+EXPORT_CHUNK_ROWS = int(os.environ.get('EXPORT_CHUNK_ROWS', '500'))
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+NAME_PROJECTION = {"_id": 0, "name": 1}
+
+def joined_name(document, field):
+    return (document.get(field) or {}).get("name", "")
+
+async def export_results(festival: str):
+    documents = store.iterate_joined(
+        "results",
+        {"festival_id": festival},
+        [("festival_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+        {
+            "event": ("events", "event_id", {"_id": 0, "name": 1, "event_type": 1, "category": 1, "event_date": 1}),
+            "winner_team": ("teams", "winner_team_id", NAME_PROJECTION),
+            "runner_up_team": ("teams", "runner_up_team_id", NAME_PROJECTION),
+            "winner_member": ("members", "winner_member_id", NAME_PROJECTION),
+            "runner_up_member": ("members", "runner_up_member_id", NAME_PROJECTION)
+        }
+    )
+    async for result in documents:
+        event = result["event"] or {}
+        placing = "team" if event.get("event_type") == "Team" else "member"
+        yield [
+            event.get("name", ""),
+            event.get("event_type", ""),
+            event.get("category", ""),
+            event.get("event_date", ""),
+            joined_name(result, f"winner_{placing}"),
+            result.get("winner_points", 0),
+            joined_name(result, f"runner_up_{placing}"),
+            result.get("runner_up_points", 0) if result.get(f"runner_up_{placing}_id") else "",
+            result.get("remarks") or "",
+            result.get("created_at", "")
+        ]
+
+async def export_rankings(festival: str):
+    documents = store.iterate_joined(
+        "members",
+        {"festival_id": festival, "category": {"$in": list(RANKING_CATEGORIES.values())}},
+        [("festival_id", ASCENDING), ("category", ASCENDING), ("individual_points", DESCENDING), ("id", ASCENDING)],
+        {"team": ("teams", "team_id", NAME_PROJECTION)}
+    )
+    category, position, rank, previous_points = None, 0, 0, None
+    async for member in documents:
+        if member["category"] != category:
+            category, position, previous_points = member["category"], 0, None
+        position += 1
+        # Same competition ranking as /individual-rankings
+        if member.get("individual_points", 0) != previous_points:
+            rank, previous_points = position, member.get("individual_points", 0)
+        yield [category, rank, member["name"], joined_name(member, "team"), previous_points]
+
+async def export_rosters(festival: str):
+    documents = store.iterate_joined(
+        "members",
+        {"festival_id": festival},
+        [("festival_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+        {"team": ("teams", "team_id", NAME_PROJECTION)}
+    )
+    async for member in documents:
+        yield [
+            joined_name(member, "team"),
+            member["name"],
+            member.get("category", ""),
+            member.get("individual_points", 0),
+            member.get("created_at", "")
+        ]
+
+EXPORTS = {
+    "results": (
+        ["Event", "Event Type", "Category", "Event Date", "Winner", "Winner Points",
+         "Runner-up", "Runner-up Points", "Remarks", "Recorded At"],
+        export_results
+    ),
+    "rankings": (["Category", "Rank", "Member", "Team", "Points"], export_rankings),
+    "rosters": (["Team", "Member", "Category", "Points", "Joined"], export_rosters)
+}
+
+async def chunk_rows(rows):
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= EXPORT_CHUNK_ROWS:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+async def stream_csv(header, rows):
+    # The BOM makes Excel read the names as UTF-8
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield "\ufeff" + buffer.getvalue()
+    async for chunk in chunk_rows(rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+async def stream_xlsx(xlsxwriter, sheet_name: str, header, rows):
+    """Write the sheet a chunk at a time into a temporary file, then stream the file.
+
+    constant_memory mode flushes each row to disk once the next one starts, and
+    the writing happens on a worker thread, so neither memory nor the event loop
+    grows with the export.
+    """
+    with tempfile.TemporaryFile() as output:
+        workbook = xlsxwriter.Workbook(output, {"constant_memory": True})
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, header, workbook.add_format({"bold": True}))
+        row_number = 1
+        
+        def write_chunk(chunk, first_row):
+            for offset, row in enumerate(chunk):
+                worksheet.write_row(first_row + offset, 0, row)
+        
+        async for chunk in chunk_rows(rows):
+            await asyncio.to_thread(write_chunk, chunk, row_number)
+            row_number += len(chunk)
+        await asyncio.to_thread(workbook.close)
+        
+        output.seek(0)
+        while data := await asyncio.to_thread(output.read, 64 * 1024):
+            yield data
+
+@api_router.get("/export/{kind}")
+async def export(
+    kind: Literal["results", "rankings", "rosters"],
+    festival: Festival,
+    format: Literal["csv", "xlsx"] = "csv",
+    current_admin: str = Depends(get_current_admin)
+):
+    header, rows = EXPORTS[kind]
+    if format == "xlsx":
+        try:
+            import xlsxwriter
+        except ImportError:
+            raise HTTPException(status_code=501, detail="XLSX export needs XlsxWriter installed")
+        body = stream_xlsx(xlsxwriter, kind.capitalize(), header, rows(festival))
+    else:
+        body = stream_csv(header, rows(festival))
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{festival}-{kind}.{format}"'}
+    )
+
+@api_router.get("/admin/indexes")
+async def get_index_status(current_admin: str = Depends(get_deployment_admin)):
+    return await check_indexes()
+
+@api_router.post("/admin/indexes")
+async def create_missing_indexes(current_admin: str = Depends(get_deployment_admin)):
+    return await ensure_indexes()
+
+@api_router.post("/admin/snapshots")
+async def republish_snapshots(festival: Festival, current_admin: str = Depends(get_current_admin)):
+    if snapshot_publisher is None:
+        raise HTTPException(status_code=404, detail="Snapshot publishing is not enabled; set SNAPSHOT_DIR")
+    return await snapshot_publisher.publish(festival)
+
+@api_router.get("/cache/stats")
+async def get_cache_stats(current_admin: str = Depends(get_deployment_admin)):
+    return {**read_cache.stats(), "coalescing": single_flight.stats()}
+
+READINESS_TIMEOUT_SECONDS = float(os.environ.get('READINESS_TIMEOUT_SECONDS', '2'))
+
+@api_router.get("/ready")
+async def readiness():
+    """For load balancer probes: 200 once bootstrapped with a live database connection."""
+    start = time.perf_counter()
+    try:
+        # Until bootstrapped, checking the marker doubles as the ping
+        if bootstrap_state["current"]:
+            await asyncio.wait_for(store.ping(), READINESS_TIMEOUT_SECONDS)
+        else:
+            bootstrap_state["current"] = await asyncio.wait_for(bootstrap_is_current(), READINESS_TIMEOUT_SECONDS)
+    except (asyncio.TimeoutError, PyMongoError):
+        raise HTTPException(status_code=503, detail="Database unreachable")
+    if not bootstrap_state["current"]:
+        raise HTTPException(status_code=503, detail="Not bootstrapped; run migrate.py")
+    return {
+        "status": "ready",
+        "storage": STORAGE_ENGINE,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Include the router in the main app
 app.include_router(api_router)
 
+app.add_middleware(CompressionMiddleware)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Configure logging
@@ -333,4 +2730,7 @@ logger = logging.getLogger(__name__)
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if snapshot_publisher is not None:
+        await snapshot_publisher.drain()
+    store.close()
+    auth_executor.shutdown(wait=False)
\ No newline at end of file
@@ -0,0 +1,803 @@
+"""Storage engines behind the API handlers.
+
+Handlers never touch a database driver directly; they go through a Store, which
+holds one Repository per collection plus the few aggregations the API needs.
+
+MotorStore is the MongoDB implementation. MemoryStore keeps documents in
+process with hash indexes and the same query, update, sort and uniqueness
+semantics (for the operators the API uses), so benchmarks, tests and small
+single-node deployments run with zero database latency. MemoryStore data lives
+only as long as the process and is not shared between workers.
+"""
+import copy
+import itertools
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+
+
+class Repository:
+    """The operations the API performs on one collection.
+
+    Queries, updates, projections and sorts use MongoDB syntax. Methods that take
+    a session accept one only so a transaction can span several repositories.
+    """
+
+    async def find(self, query=None, projection=None, sort=None, skip=0, limit=None):
+        raise NotImplementedError
+
+    def iterate(self, query=None, projection=None, sort=None, limit=None):
+        """Async iterator over matching documents, for streaming responses."""
+        raise NotImplementedError
+
+    async def find_one(self, query=None, projection=None):
+        raise NotImplementedError
+
+    async def find_one_and_update(self, query, update, session=None, upsert=False):
+        """Apply update to the first match and return it as it was before (None if upserted)."""
+        raise NotImplementedError
+
+    async def count(self, query=None):
+        raise NotImplementedError
+
+    async def insert_one(self, document, session=None):
+        raise NotImplementedError
+
+    async def insert_many(self, documents):
+        """Unordered insert. Returns (inserted count, [(index, error message), ...])."""
+        raise NotImplementedError
+
+    async def update_one(self, query, update, session=None, upsert=False):
+        """Returns the number of matched documents."""
+        raise NotImplementedError
+
+    async def update_many(self, query, update):
+        raise NotImplementedError
+
+    async def replace_one(self, query, document, upsert=False):
+        raise NotImplementedError
+
+    async def delete_one(self, query, session=None):
+        """Returns the number of deleted documents."""
+        raise NotImplementedError
+
+    async def delete_many(self, query):
+        """Returns the number of deleted documents."""
+        raise NotImplementedError
+
+    async def bulk_update(self, operations, ordered=True, session=None):
+        """Apply [(query, update), ...] in one batch. Returns the matched count."""
+        raise NotImplementedError
+
+    async def index_information(self):
+        raise NotImplementedError
+
+    async def create_index(self, index):
+        """Create an index from a pymongo IndexModel."""
+        raise NotImplementedError
+
+
+class Store:
+    teams: Repository
+    members: Repository
+    events: Repository
+    results: Repository
+    points_config: Repository
+    admins: Repository
+    reconciliation: Repository
+    migrations: Repository
+    timeline: Repository
+    versions: Repository
+
+    COLLECTIONS = (
+        "teams", "members", "events", "results", "points_config", "admins", "reconciliation", "migrations", "timeline",
+        "versions"
+    )
+
+    def __getitem__(self, name) -> Repository:
+        if name not in self.COLLECTIONS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    async def ping(self):
+        """Round-trip to the database; raises if it cannot be reached."""
+
+    async def transactions_supported(self) -> bool:
+        return False
+
+    async def run_in_transaction(self, callback):
+        """Run callback(session) in a multi-document transaction."""
+        raise NotImplementedError
+
+    async def rank_members(self, categories, offset, limit, projection, match=None):
+        """Members of each category ordered by individual_points, descending.
+
+        categories maps a response key to a category value and match narrows the
+        members considered. Returns, per key, the page of documents and, under
+        "<key>_total", the size of the category.
+        """
+        raise NotImplementedError
+
+    async def score_totals(self, match=None, in_flight_after=None):
+        """Sum result points per (collection, id) from the results matching match.
+
+        Team events score for teams and other events for members; results whose
+        event no longer exists do not count. An entity named in a result whose
+        points_pending_since is later than in_flight_after maps to None instead:
+        its counter may or may not include that result yet.
+        """
+        raise NotImplementedError
+
+    async def team_stats(self, match):
+        """Per-team figures for the teams, members and results matching match.
+
+        Returns {"teams": [team documents], "members": {(team_id, category):
+        (member count, summed individual_points)}, "placings": {(team_id, place):
+        count}} where place is "winner" or "runner_up". Placings count the same
+        results score_totals credits to teams.
+        """
+        raise NotImplementedError
+
+    def iterate_joined(self, collection, match, sort, joins):
+        """Async iterator over a collection's documents with the documents they reference.
+
+        joins maps an output field to (collection, local field, projection): each
+        document gains the projected document whose id equals its local field, or
+        None when there is none. Documents are produced in sort order as the
+        cursor advances, so callers can stream arbitrarily large joins.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+# MongoDB, through Motor
+class MotorRepository(Repository):
+    def __init__(self, collection):
+        self.collection = collection
+
+    def _cursor(self, query, projection, sort, skip=0, limit=None):
+        cursor = self.collection.find(query or {}, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return cursor
+
+    async def find(self, query=None, projection=None, sort=None, skip=0, limit=None):
+        return await self._cursor(query, projection, sort, skip, limit).to_list(length=None)
+
+    def iterate(self, query=None, projection=None, sort=None, limit=None):
+        return self._cursor(query, projection, sort, limit=limit)
+
+    async def find_one(self, query=None, projection=None):
+        return await self.collection.find_one(query or {}, projection)
+
+    async def find_one_and_update(self, query, update, session=None, upsert=False):
+        return await self.collection.find_one_and_update(query, update, upsert=upsert, session=session)
+
+    async def count(self, query=None):
+        return await self.collection.count_documents(query or {})
+
+    async def insert_one(self, document, session=None):
+        # Motor adds _id to the dict it is given; keep the caller's copy clean
+        await self.collection.insert_one(dict(document), session=session)
+
+    async def insert_many(self, documents):
+        if not documents:
+            return 0, []
+        try:
+            outcome = await self.collection.insert_many([dict(d) for d in documents], ordered=False)
+            return len(outcome.inserted_ids), []
+        except BulkWriteError as e:
+            errors = [(error["index"], error["errmsg"]) for error in e.details["writeErrors"]]
+            return e.details["nInserted"], errors
+
+    async def update_one(self, query, update, session=None, upsert=False):
+        return (await self.collection.update_one(query, update, upsert=upsert, session=session)).matched_count
+
+    async def update_many(self, query, update):
+        return (await self.collection.update_many(query, update)).matched_count
+
+    async def replace_one(self, query, document, upsert=False):
+        return (await self.collection.replace_one(query, document, upsert=upsert)).matched_count
+
+    async def delete_one(self, query, session=None):
+        return (await self.collection.delete_one(query, session=session)).deleted_count
+
+    async def delete_many(self, query):
+        return (await self.collection.delete_many(query)).deleted_count
+
+    async def bulk_update(self, operations, ordered=True, session=None):
+        if not operations:
+            return 0
+        outcome = await self.collection.bulk_write(
+            [UpdateOne(query, update) for query, update in operations],
+            ordered=ordered,
+            session=session
+        )
+        return outcome.matched_count
+
+    async def index_information(self):
+        return await self.collection.index_information()
+
+    async def create_index(self, index):
+        await self.collection.create_indexes([index])
+
+
+class MotorStore(Store):
+    def __init__(self, client, db_name, transactions="auto"):
+        self.client = client
+        self.db = client[db_name]
+        self.transactions = transactions
+        self._transactions_supported = None
+        for name in self.COLLECTIONS:
+            setattr(self, name, MotorRepository(self.db[name]))
+
+    async def ping(self):
+        await self.client.admin.command("ping")
+
+    async def transactions_supported(self) -> bool:
+        # Multi-document transactions need a replica set or mongos
+        if self._transactions_supported is None:
+            if self.transactions in ("on", "off"):
+                self._transactions_supported = self.transactions == "on"
+            else:
+                try:
+                    hello = await self.client.admin.command("hello")
+                    self._transactions_supported = "setName" in hello or hello.get("msg") == "isdbgrid"
+                except PyMongoError:
+                    self._transactions_supported = False
+        return self._transactions_supported
+
+    async def run_in_transaction(self, callback):
+        async with await self.client.start_session() as session:
+            return await session.with_transaction(callback)
+
+    async def rank_members(self, categories, offset, limit, projection, match=None):
+        match = match or {}
+        page = [{"$skip": offset}] if offset else []
+        if limit is not None:
+            page.append({"$limit": max(limit, 1)})
+        page.append({"$project": projection})
+
+        facets = {}
+        for key, category in categories.items():
+            facets[key] = [{"$match": {"category": category}}] + page
+            facets[f"{key}_total"] = [{"$match": {"category": category}}, {"$count": "count"}]
+
+        # The $match/$sort prefix walks the (festival_id, category, individual_points, id) index;
+        # id breaks ties so pages neither repeat nor skip members with equal points
+        pipeline = [
+            {"$match": {**match, "category": {"$in": list(categories.values())}}},
+            {"$sort": {**{field: 1 for field in match}, "category": 1, "individual_points": -1, "id": 1}},
+            {"$facet": facets}
+        ]
+        [ranked] = await self.db.members.aggregate(pipeline).to_list(length=1)
+        for key in categories:
+            totals = ranked[f"{key}_total"]
+            ranked[f"{key}_total"] = totals[0]["count"] if totals else 0
+            if limit is not None:
+                ranked[key] = ranked[key][:limit]
+        return ranked
+
+    async def score_totals(self, match=None, in_flight_after=None):
+        is_team = {"$eq": ["$event.event_type", "Team"]}
+        # A missing marker sorts below any string, so settled results are never in flight
+        in_flight = False if in_flight_after is None else {"$gt": ["$points_pending_since", in_flight_after]}
+        pipeline = [{"$match": match}] if match else []
+        pipeline += [
+            {"$lookup": {"from": "events", "localField": "event_id", "foreignField": "id", "as": "event"}},
+            {"$unwind": "$event"},
+            {"$project": {
+                "_id": 0,
+                "collection": {"$cond": [is_team, "teams", "members"]},
+                "winner_id": {"$cond": [is_team, "$winner_team_id", "$winner_member_id"]},
+                "runner_up_id": {"$cond": [is_team, "$runner_up_team_id", "$runner_up_member_id"]},
+                "winner_points": 1,
+                "runner_up_points": 1,
+                "in_flight": in_flight
+            }},
+            {"$facet": {
+                placing: [
+                    {"$match": {f"{placing}_id": {"$ne": None}}},
+                    {"$group": {
+                        "_id": {"collection": "$collection", "id": f"${placing}_id"},
+                        "points": {"$sum": f"${placing}_points"},
+                        "in_flight": {"$max": "$in_flight"}
+                    }}
+                ]
+                for placing in ("winner", "runner_up")
+            }}
+        ]
+        [placings] = await self.db.results.aggregate(pipeline).to_list(length=1)
+        totals = {}
+        for rows in placings.values():
+            for row in rows:
+                key = (row["_id"]["collection"], row["_id"]["id"])
+                if row["in_flight"] or (key in totals and totals[key] is None):
+                    totals[key] = None
+                else:
+                    totals[key] = totals.get(key, 0) + row["points"]
+        return totals
+
+    async def team_stats(self, match):
+        def collection_facet(source, stages):
+            # Pulls another collection into the facet; the teams matched only seed it
+            return [
+                {"$limit": 1},
+                {"$lookup": {"from": source, "pipeline": [{"$match": match}] + stages, "as": "rows"}},
+                {"$unwind": "$rows"},
+                {"$replaceRoot": {"newRoot": "$rows"}}
+            ]
+
+        pipeline = [
+            {"$match": match},
+            {"$facet": {
+                "teams": [
+                    {"$sort": {"total_points": -1, "created_at": 1}},
+                    {"$project": {"_id": 0, "id": 1, "name": 1, "color": 1, "total_points": 1}}
+                ],
+                "members": collection_facet("members", [
+                    {"$group": {
+                        "_id": {"team_id": "$team_id", "category": "$category"},
+                        "count": {"$sum": 1},
+                        "points": {"$sum": "$individual_points"}
+                    }}
+                ]),
+                # Like score_totals: only results of team events that still exist
+                "placings": collection_facet("results", [
+                    {"$lookup": {"from": "events", "localField": "event_id", "foreignField": "id", "as": "event"}},
+                    {"$match": {"event.event_type": "Team"}},
+                    {"$project": {"placings": [
+                        {"team_id": "$winner_team_id", "place": "winner"},
+                        {"team_id": "$runner_up_team_id", "place": "runner_up"}
+                    ]}},
+                    {"$unwind": "$placings"},
+                    {"$match": {"placings.team_id": {"$ne": None}}},
+                    {"$group": {"_id": "$placings", "count": {"$sum": 1}}}
+                ])
+            }}
+        ]
+        [facets] = await self.db.teams.aggregate(pipeline).to_list(length=1)
+        return {
+            "teams": facets["teams"],
+            "members": {
+                (row["_id"]["team_id"], row["_id"]["category"]): (row["count"], row["points"])
+                for row in facets["members"]
+            },
+            "placings": {(row["_id"]["team_id"], row["_id"]["place"]): row["count"] for row in facets["placings"]}
+        }
+
+    async def iterate_joined(self, collection, match, sort, joins):
+        pipeline = [{"$match": match}, {"$sort": dict(sort)}]
+        for field, (source, local_field, projection) in joins.items():
+            pipeline += [
+                # Each lookup is one probe of the source's unique id index
+                {"$lookup": {
+                    "from": source,
+                    "let": {"ref": f"${local_field}"},
+                    "pipeline": [
+                        {"$match": {"$expr": {"$eq": ["$id", "$$ref"]}}},
+                        {"$limit": 1},
+                        {"$project": projection}
+                    ],
+                    "as": field
+                }},
+                {"$set": {field: {"$ifNull": [{"$arrayElemAt": [f"${field}", 0]}, None]}}}
+            ]
+        pipeline.append({"$project": {"_id": 0}})
+        async for document in self.db[collection].aggregate(pipeline):
+            yield document
+
+    def close(self):
+        self.client.close()
+
+
+# In-process engine
+_MISSING = object()
+
+
+def _compare(op, value, operand):
+    if value is _MISSING or value is None or operand is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        return value <= operand
+    except TypeError:
+        # Like MongoDB, range operators only match values of a comparable type
+        return False
+
+
+def _equals(value, operand):
+    if operand is None:
+        return value is _MISSING or value is None
+    return value is not _MISSING and value == operand
+
+
+def _condition_matches(value, condition):
+    for op, operand in condition.items():
+        if op == "$eq":
+            matched = _equals(value, operand)
+        elif op == "$ne":
+            matched = not _equals(value, operand)
+        elif op == "$in":
+            matched = any(_equals(value, item) for item in operand)
+        elif op == "$nin":
+            matched = not any(_equals(value, item) for item in operand)
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            matched = _compare(op, value, operand)
+        elif op == "$exists":
+            matched = (value is not _MISSING) == bool(operand)
+        elif op == "$type":
+            matched = {"string": str, "int": int, "bool": bool, "object": dict}[operand] is type(value)
+        else:
+            raise NotImplementedError(f"MemoryStore does not support {op}")
+        if not matched:
+            return False
+    return True
+
+
+def matches(document, query):
+    for key, condition in (query or {}).items():
+        if key == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+        elif key == "$and":
+            if not all(matches(document, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+            if not _condition_matches(document.get(key, _MISSING), condition):
+                return False
+        elif not _equals(document.get(key, _MISSING), condition):
+            return False
+    return True
+
+
+def project(document, projection):
+    if not projection:
+        return dict(document)
+    included = [field for field, flag in projection.items() if flag and field != "_id"]
+    if included:
+        result = {field: document[field] for field in included if field in document}
+        if projection.get("_id", 1) and "_id" in document:
+            result["_id"] = document["_id"]
+        return result
+    excluded = {field for field, flag in projection.items() if not flag}
+    return {field: value for field, value in document.items() if field not in excluded}
+
+
+def sort_documents(documents, sort):
+    if not sort:
+        return documents
+    if isinstance(sort, str):
+        sort = [(sort, 1)]
+    # Stable sorts applied from the last key to the first; missing/null sorts lowest
+    for field, direction in reversed(list(sort)):
+        documents.sort(
+            key=lambda d: (d.get(field) is not None, d.get(field) if d.get(field) is not None else 0),
+            reverse=direction == DESCENDING
+        )
+    return documents
+
+
+def _parent(document, field):
+    """The dict holding a (possibly dotted) field, created on the way down, and the last key."""
+    *path, last = field.split(".")
+    for part in path:
+        document = document.setdefault(part, {})
+    return document, last
+
+
+def apply_update(document, update, inserting=False):
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not inserting:
+            continue
+        for field, value in fields.items():
+            parent, key = _parent(document, field)
+            if op in ("$set", "$setOnInsert"):
+                parent[key] = copy.deepcopy(value)
+            elif op == "$inc":
+                parent[key] = parent.get(key, 0) + value
+            elif op == "$unset":
+                parent.pop(key, None)
+            else:
+                raise NotImplementedError(f"MemoryStore does not support {op}")
+
+
+def _upsert_seed(query):
+    # Equality conditions in the filter seed an upserted document
+    return {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+
+
+class MemoryRepository(Repository):
+    def __init__(self, name):
+        self.name = name
+        self._documents = {}
+        self._keys = itertools.count()
+        # field -> value -> set of document keys
+        self._indexes = {}
+        # index name -> (fields, unique, partial filter); hashed on the leading field
+        self._index_specs = {"_id_": (("_id",), True, None)}
+        self._build_index("_id")
+        # Every handler looks documents up by their application id
+        self._build_index("id")
+
+    # Index maintenance
+    def _build_index(self, field):
+        if field in self._indexes:
+            return
+        index = self._indexes[field] = {}
+        for key, document in self._documents.items():
+            index.setdefault(self._index_value(document, field), set()).add(key)
+
+    @staticmethod
+    def _index_value(document, field):
+        value = document.get(field)
+        return value if not isinstance(value, (dict, list)) else repr(value)
+
+    def _add_to_indexes(self, key, document):
+        for field, index in self._indexes.items():
+            index.setdefault(self._index_value(document, field), set()).add(key)
+
+    def _remove_from_indexes(self, key, document):
+        for field, index in self._indexes.items():
+            value = self._index_value(document, field)
+            keys = index.get(value)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[value]
+
+    def _check_unique(self, document, key=None):
+        for name, (fields, unique, partial) in self._index_specs.items():
+            if not unique or (partial and not matches(document, partial)):
+                continue
+            values = [self._index_value(document, field) for field in fields]
+            for other in self._indexes[fields[0]].get(values[0], ()):
+                if other == key or (partial and not matches(self._documents[other], partial)):
+                    continue
+                if all(self._index_value(self._documents[other], field) == value for field, value in zip(fields[1:], values[1:])):
+                    duplicate = ", ".join(f"{field}: {document.get(field)!r}" for field in fields)
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.name} index: {name} dup key: {{ {duplicate} }}"
+                    )
+
+    def _candidates(self, query):
+        # Narrow with the most selective equality or $in condition on an indexed field, else scan
+        best = None
+        for field, condition in (query or {}).items():
+            if field not in self._indexes:
+                continue
+            if isinstance(condition, dict):
+                if set(condition) != {"$in"}:
+                    continue
+                values = condition["$in"]
+            else:
+                values = [condition]
+            if any(value is None or isinstance(value, (dict, list)) for value in values):
+                continue
+            index = self._indexes[field]
+            buckets = [index.get(value, ()) for value in values]
+            size = sum(len(bucket) for bucket in buckets)
+            if best is None or size < best[0]:
+                best = (size, buckets)
+        if best is None:
+            return list(self._documents)
+        return sorted(set().union(*best[1]))
+
+    def _matching_keys(self, query):
+        return [key for key in self._candidates(query) if matches(self._documents[key], query)]
+
+    def _select(self, query, sort=None, skip=0, limit=None):
+        documents = [self._documents[key] for key in self._matching_keys(query)]
+        documents = sort_documents(documents, sort)
+        end = None if limit is None else skip + limit
+        return documents[skip:end]
+
+    def _insert(self, document):
+        document = copy.deepcopy(document)
+        document.setdefault("_id", ObjectId())
+        self._check_unique(document)
+        key = next(self._keys)
+        self._documents[key] = document
+        self._add_to_indexes(key, document)
+
+    def _upsert(self, query, update):
+        document = _upsert_seed(query)
+        apply_update(document, update, inserting=True)
+        self._insert(document)
+
+    def _update(self, key, update):
+        document = self._documents[key]
+        updated = copy.deepcopy(document)
+        apply_update(updated, update)
+        self._check_unique(updated, key)
+        self._remove_from_indexes(key, document)
+        self._documents[key] = updated
+        self._add_to_indexes(key, updated)
+
+    # Repository interface; no awaits inside, so every call is atomic on the event loop
+    async def find(self, query=None, projection=None, sort=None, skip=0, limit=None):
+        return [project(d, projection) for d in self._select(query, sort, skip, limit)]
+
+    async def iterate(self, query=None, projection=None, sort=None, limit=None):
+        for document in self._select(query, sort, limit=limit):
+            yield project(document, projection)
+
+    async def find_one(self, query=None, projection=None):
+        keys = self._matching_keys(query)
+        return project(self._documents[keys[0]], projection) if keys else None
+
+    async def find_one_and_update(self, query, update, session=None, upsert=False):
+        keys = self._matching_keys(query)
+        if not keys:
+            if upsert:
+                self._upsert(query, update)
+            return None
+        before = copy.deepcopy(self._documents[keys[0]])
+        self._update(keys[0], update)
+        return before
+
+    async def count(self, query=None):
+        if not query:
+            return len(self._documents)
+        return len(self._matching_keys(query))
+
+    async def insert_one(self, document, session=None):
+        self._insert(document)
+
+    async def insert_many(self, documents):
+        inserted, errors = 0, []
+        for index, document in enumerate(documents):
+            try:
+                self._insert(document)
+                inserted += 1
+            except DuplicateKeyError as e:
+                errors.append((index, str(e)))
+        return inserted, errors
+
+    async def update_one(self, query, update, session=None, upsert=False):
+        keys = self._matching_keys(query)
+        if keys:
+            self._update(keys[0], update)
+        elif upsert:
+            self._upsert(query, update)
+        return len(keys[:1])
+
+    async def update_many(self, query, update):
+        keys = self._matching_keys(query)
+        for key in keys:
+            self._update(key, update)
+        return len(keys)
+
+    async def replace_one(self, query, document, upsert=False):
+        keys = self._matching_keys(query)
+        if not keys:
+            if upsert:
+                self._insert({**_upsert_seed(query), **document})
+            return 0
+        key = keys[0]
+        replacement = copy.deepcopy(document)
+        replacement["_id"] = self._documents[key]["_id"]
+        self._check_unique(replacement, key)
+        self._remove_from_indexes(key, self._documents[key])
+        self._documents[key] = replacement
+        self._add_to_indexes(key, replacement)
+        return 1
+
+    async def delete_one(self, query, session=None):
+        keys = self._matching_keys(query)
+        if not keys:
+            return 0
+        self._remove_from_indexes(keys[0], self._documents.pop(keys[0]))
+        return 1
+
+    async def delete_many(self, query):
+        keys = self._matching_keys(query)
+        for key in keys:
+            self._remove_from_indexes(key, self._documents.pop(key))
+        return len(keys)
+
+    async def bulk_update(self, operations, ordered=True, session=None):
+        # Fails like pymongo's bulk_write: the errors carry each failed operation's index
+        matched, errors = 0, []
+        for index, (query, update) in enumerate(operations):
+            try:
+                matched += await self.update_one(query, update)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": {"q": query, "u": update}})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nMatched": matched, "nModified": matched})
+        return matched
+
+    async def index_information(self):
+        return {
+            name: {"key": [(field, 1) for field in fields], "unique": unique}
+            for name, (fields, unique, _) in self._index_specs.items()
+        }
+
+    async def create_index(self, index):
+        spec = index.document
+        # Hash indexes only; a compound index is indexed on its leading field
+        fields = tuple(spec["key"])
+        self._build_index(fields[0])
+        self._index_specs[spec["name"]] = (fields, spec.get("unique", False), spec.get("partialFilterExpression"))
+        if spec.get("unique"):
+            for key, document in self._documents.items():
+                self._check_unique(document, key)
+
+
+class MemoryStore(Store):
+    def __init__(self):
+        for name in self.COLLECTIONS:
+            setattr(self, name, MemoryRepository(name))
+
+    async def rank_members(self, categories, offset, limit, projection, match=None):
+        ranked = {}
+        for key, category in categories.items():
+            members = self.members._select(
+                {**(match or {}), "category": category}, [("individual_points", DESCENDING), ("id", ASCENDING)]
+            )
+            end = None if limit is None else offset + limit
+            ranked[key] = [project(member, projection) for member in members[offset:end]]
+            ranked[f"{key}_total"] = len(members)
+        return ranked
+
+    async def score_totals(self, match=None, in_flight_after=None):
+        totals = {}
+        for result in self.results._select(match):
+            event = await self.events.find_one({"id": result.get("event_id")})
+            if event is None:
+                continue
+            if event.get("event_type") == "Team":
+                collection, placings = "teams", ("winner_team_id", "runner_up_team_id")
+            else:
+                collection, placings = "members", ("winner_member_id", "runner_up_member_id")
+            pending_since = result.get("points_pending_since")
+            in_flight = in_flight_after is not None and pending_since is not None and pending_since > in_flight_after
+            for field, points_field in zip(placings, ("winner_points", "runner_up_points")):
+                if result.get(field) is not None:
+                    key = (collection, result[field])
+                    if in_flight or (key in totals and totals[key] is None):
+                        totals[key] = None
+                    else:
+                        totals[key] = totals.get(key, 0) + result.get(points_field, 0)
+        return totals
+
+    async def team_stats(self, match):
+        teams = self.teams._select(match, [("total_points", DESCENDING), ("created_at", 1)])
+        members = {}
+        for member in self.members._select(match):
+            key = (member.get("team_id"), member.get("category"))
+            count, points = members.get(key, (0, 0))
+            members[key] = (count + 1, points + member.get("individual_points", 0))
+        placings = {}
+        for result in self.results._select(match):
+            event = await self.events.find_one({"id": result.get("event_id")}, {"event_type": 1})
+            if event is None or event.get("event_type") != "Team":
+                continue
+            for field, place in (("winner_team_id", "winner"), ("runner_up_team_id", "runner_up")):
+                if result.get(field) is not None:
+                    placings[(result[field], place)] = placings.get((result[field], place), 0) + 1
+        projection = {"_id": 0, "id": 1, "name": 1, "color": 1, "total_points": 1}
+        return {"teams": [project(team, projection) for team in teams], "members": members, "placings": placings}
+
+    async def iterate_joined(self, collection, match, sort, joins):
+        for document in self[collection]._select(match, sort):
+            document = project(document, {"_id": 0})
+            for field, (source, local_field, projection) in joins.items():
+                value = document.get(local_field)
+                document[field] = None if value is None else await self[source].find_one({"id": value}, projection)
+            yield document
@@ -0,0 +1,269 @@
+"""Local load test for the backend API.
+
+Runs the FastAPI app in-process (no network, no remote preview URL) on the
+in-memory storage engine, seeds a festival-sized data set and drives concurrent
+traffic that mixes the public reads with create_result writes. Latency
+percentiles and throughput are reported per route and saved as JSON, which
+later runs can be compared against with --baseline.
+
+    python benchmarks/load.py --output bench.json
+    python benchmarks/load.py --baseline bench.json
+    python benchmarks/load.py --mongo-url mongodb://localhost:27017  # real server
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# (method, path, weight) - roughly what festival-day dashboards and admins send
+TRAFFIC_MIX = [
+    ("GET", "/api/dashboard", 20),
+    ("GET", "/api/scoreboard", 20),
+    ("GET", "/api/individual-rankings", 15),
+    ("GET", "/api/teams", 10),
+    ("GET", "/api/events", 10),
+    ("GET", "/api/results", 5),
+    ("GET", "/api/members?limit=100", 5),
+    ("POST", "/api/results", 5),
+]
+
+
+def load_server(mongo_url, db_name):
+    if mongo_url:
+        os.environ["STORAGE_ENGINE"] = "mongo"
+        os.environ["MONGO_URL"] = mongo_url
+        os.environ["DB_NAME"] = db_name
+    else:
+        # Nothing to install or start, and no database latency in the numbers
+        os.environ["STORAGE_ENGINE"] = "memory"
+    sys.path.insert(0, str(BACKEND_DIR))
+    import server
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return server
+
+
+async def seed(store, teams, members, events, completed, festival="default"):
+    now = datetime.now(timezone.utc)
+    team_docs = [
+        {
+            "id": str(uuid.uuid4()),
+            "festival_id": festival,
+            "name": f"Team {i}",
+            "color": "#FF6B35",
+            "total_points": 0,
+            "created_at": now.isoformat()
+        }
+        for i in range(teams)
+    ]
+    await store.teams.insert_many(team_docs)
+
+    member_docs = [
+        {
+            "id": str(uuid.uuid4()),
+            "festival_id": festival,
+            "name": f"Member {i}",
+            "name_key": f"member {i}",
+            "category": "Adult" if i % 3 else "Kid",
+            "team_id": team_docs[i % teams]["id"],
+            "individual_points": random.randint(0, 100),
+            "created_at": (now + timedelta(microseconds=i)).isoformat()
+        }
+        for i in range(members)
+    ]
+    if member_docs:
+        await store.members.insert_many(member_docs)
+
+    event_docs = [
+        {
+            "id": str(uuid.uuid4()),
+            "festival_id": festival,
+            "name": f"Event {i}",
+            "description": "Benchmark event",
+            "event_date": (now + timedelta(hours=i)).isoformat(),
+            "category": "Mixed",
+            "event_type": "Team",
+            "is_completed": i < completed,
+            "created_at": now.isoformat()
+        }
+        for i in range(events)
+    ]
+    await store.events.insert_many(event_docs)
+
+    result_docs = [
+        {
+            "id": str(uuid.uuid4()),
+            "festival_id": festival,
+            "event_id": event["id"],
+            "winner_team_id": team_docs[i % teams]["id"],
+            "runner_up_team_id": team_docs[(i + 1) % teams]["id"],
+            "winner_points": 10,
+            "runner_up_points": 5,
+            "created_at": (now + timedelta(microseconds=i)).isoformat()
+        }
+        for i, event in enumerate(event_docs[:completed])
+    ]
+    if result_docs:
+        await store.results.insert_many(result_docs)
+
+    pending = [event["id"] for event in event_docs[completed:]]
+    return [team["id"] for team in team_docs], pending
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples, errors, elapsed):
+    routes = {}
+    for route in sorted(set(samples) | set(errors)):
+        latencies = sorted(samples.get(route, []))
+        routes[route] = {
+            "count": len(latencies),
+            "errors": errors.get(route, 0),
+            "throughput_rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "max_ms": round((latencies[-1] if latencies else 0) * 1000, 2)
+        }
+    return routes
+
+
+async def run(args):
+    server = load_server(args.mongo_url, args.db_name)
+    store = server.store
+    if args.mongo_url:
+        for collection in store.COLLECTIONS:
+            await store.db[collection].drop()
+
+    # Seeding first means startup finds teams and skips the default ones
+    team_ids, pending_events = await seed(store, args.teams, args.members, args.events, args.completed)
+    await server.app.router.startup()
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        routes = [(method, path) for method, path, _ in TRAFFIC_MIX]
+        weights = [weight for _, _, weight in TRAFFIC_MIX]
+        samples, errors = {}, {}
+        deadline = time.perf_counter() + args.duration
+
+        async def worker(seed_value):
+            rng = random.Random(seed_value)
+            while time.perf_counter() < deadline:
+                method, path = rng.choices(routes, weights)[0]
+                if method == "POST":
+                    if not pending_events:
+                        continue
+                    body = {
+                        "event_id": pending_events.pop(),
+                        "winner_team_id": rng.choice(team_ids),
+                        "runner_up_team_id": rng.choice(team_ids)
+                    }
+                    request = client.post(path, json=body, headers=headers)
+                else:
+                    request = client.get(path)
+                label = f"{method} {path}"
+                start = time.perf_counter()
+                try:
+                    response = await request
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                latency = time.perf_counter() - start
+                if ok:
+                    samples.setdefault(label, []).append(latency)
+                else:
+                    errors[label] = errors.get(label, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+
+    await server.app.router.shutdown()
+    total = sum(len(latencies) for latencies in samples.values())
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "store": "mongodb" if args.mongo_url else "memory",
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 2),
+            "teams": args.teams,
+            "members": args.members,
+            "events": args.events,
+            "completed_events": args.completed,
+            "total_requests": total,
+            "throughput_rps": round(total / elapsed, 1)
+        },
+        "routes": summarize(samples, errors, elapsed)
+    }
+
+
+def print_report(report, baseline=None):
+    meta = report["meta"]
+    print(
+        f"{meta['total_requests']} requests in {meta['duration_s']}s "
+        f"({meta['throughput_rps']} req/s, concurrency {meta['concurrency']}, store {meta['store']})"
+    )
+    header = f"{'route':<36} {'count':>7} {'err':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    if baseline:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    for route, stats in report["routes"].items():
+        line = (
+            f"{route:<36} {stats['count']:>7} {stats['errors']:>5} {stats['throughput_rps']:>8} "
+            f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8}"
+        )
+        base = (baseline or {}).get("routes", {}).get(route)
+        if base and base["p95_ms"]:
+            change = (stats["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+            line += f" {change:>+11.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", help="Benchmark against a real MongoDB instead of the stand-in")
+    parser.add_argument("--db-name", default="onam_benchmark")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of traffic")
+    parser.add_argument("--teams", type=int, default=4)
+    parser.add_argument("--members", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=3000)
+    parser.add_argument("--completed", type=int, default=200, help="Events that already have a result")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previously saved JSON report")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    report = asyncio.run(run(args))
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Compare the old and lean read serialization paths for list endpoints.
+
+The old path rebuilt a Pydantic model per document through parse_from_mongo,
+then FastAPI validated and encoded the list again for response_model. The lean
+path encodes the projected documents with orjson. Both start from documents as
+Motor returns them, so Mongo time is excluded.
+
+    python benchmarks/serialization.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+from bson import ObjectId
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+import server  # noqa: E402
+
+
+def make_members(count):
+    team_ids = [str(uuid.uuid4()) for _ in range(2)]
+    created_at = datetime.now(timezone.utc).isoformat()
+    return [
+        {
+            "_id": ObjectId(),
+            "id": str(uuid.uuid4()),
+            "name": f"Member {i}",
+            "category": "Adult" if i % 3 else "Kid",
+            "team_id": team_ids[i % 2],
+            "individual_points": i % 50,
+            "created_at": created_at
+        }
+        for i in range(count)
+    ]
+
+
+async def old_path(documents, field):
+    # parse_from_mongo mutates, so each run gets fresh copies like a new query would
+    members = [server.Member(**server.parse_from_mongo(dict(document))) for document in documents]
+    content = await serialize_response(field=field, response_content=members)
+    return JSONResponse(content).body
+
+
+async def lean_path(documents):
+    _, defaults = server.lean_shape(server.Member)
+    # The projection drops _id server-side; mimic it here
+    projected = [{k: v for k, v in document.items() if k != "_id"} for document in documents]
+    return ORJSONResponse([{**defaults, **document} for document in projected]).body
+
+
+async def timed(coroutine_factory, repeat):
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await coroutine_factory()
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+async def main(sizes, repeat):
+    field = create_response_field(name="Response_get_members", type_=List[server.Member])
+    print(f"{'documents':>10} {'old ms':>10} {'lean ms':>10} {'speedup':>8} {'old KB':>8} {'lean KB':>8}")
+    for size in sizes:
+        documents = make_members(size)
+        old_time, old_size = await timed(lambda: old_path(documents, field), repeat)
+        lean_time, lean_size = await timed(lambda: lean_path(documents), repeat)
+        print(
+            f"{size:>10} {old_time * 1000:>10.1f} {lean_time * 1000:>10.1f} "
+            f"{old_time / lean_time:>7.1f}x {old_size / 1024:>8.0f} {lean_size / 1024:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
@@ -0,0 +1,126 @@
+"""Per-festival read latency as the number of festivals in one deployment grows.
+
+Seeds festivals of identical size in steps (1, then 10, then 100 by default)
+and after each step times the public reads of randomly chosen festivals. The
+read cache is disabled so every request reaches the store. Because every
+per-festival query is narrowed by an index that leads with festival_id, the
+latencies should stay flat from step to step. A route whose cost grows with
+the festival count is scanning other festivals' data.
+
+    python benchmarks/tenants.py
+    python benchmarks/tenants.py --steps 1 10 100 500 --output tenants.json
+    python benchmarks/tenants.py --mongo-url mongodb://localhost:27017  # real server
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from load import load_server, percentile, seed
+
+ROUTES = [
+    "/api/teams",
+    "/api/members",
+    "/api/members?limit=100",
+    "/api/events",
+    "/api/results",
+    "/api/scoreboard",
+    "/api/individual-rankings?top=10",
+    "/api/points-config",
+    "/api/dashboard",
+]
+
+
+async def run(args):
+    # Measure the queries, not the cache
+    os.environ["READ_CACHE_MAX_ENTRIES"] = "0"
+    server = load_server(args.mongo_url, args.db_name)
+    store = server.store
+    if args.mongo_url:
+        for collection in store.COLLECTIONS:
+            await store.db[collection].drop()
+    await server.app.router.startup()
+
+    steps = []
+    seeded = 0
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for festivals in sorted(args.steps):
+            seed_started = time.perf_counter()
+            while seeded < festivals:
+                await seed(store, args.teams, args.members, args.events, args.completed, festival=f"festival-{seeded}")
+                seeded += 1
+            seed_seconds = time.perf_counter() - seed_started
+
+            routes = {}
+            for route in ROUTES:
+                latencies = []
+                for _ in range(args.requests):
+                    festival = f"festival-{rng.randrange(festivals)}"
+                    start = time.perf_counter()
+                    response = await client.get(route, headers={"X-Festival": festival})
+                    latencies.append(time.perf_counter() - start)
+                    response.raise_for_status()
+                latencies.sort()
+                routes[route] = {
+                    "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+                    "p95_ms": round(percentile(latencies, 0.95) * 1000, 3)
+                }
+            steps.append({"festivals": festivals, "seed_s": round(seed_seconds, 2), "routes": routes})
+            print(f"{festivals} festivals seeded in {seed_seconds:.1f}s", flush=True)
+
+    await server.app.router.shutdown()
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "store": "mongodb" if args.mongo_url else "memory",
+            "per_festival": {
+                "teams": args.teams,
+                "members": args.members,
+                "events": args.events,
+                "completed_events": args.completed
+            },
+            "requests_per_route": args.requests
+        },
+        "steps": steps
+    }
+
+
+def print_report(report):
+    steps = report["steps"]
+    header = f"{'route (p50 ms)':<34}" + "".join(f"{step['festivals']:>10}" for step in steps) + f"{'growth':>9}"
+    print(header)
+    for route in ROUTES:
+        values = [step["routes"][route]["p50_ms"] for step in steps]
+        growth = values[-1] / values[0] if values[0] else 0
+        print(f"{route:<34}" + "".join(f"{value:>10}" for value in values) + f"{growth:>8.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mongo-url", help="Benchmark against a real MongoDB instead of the in-memory engine")
+    parser.add_argument("--db-name", default="onam_tenant_benchmark")
+    parser.add_argument("--steps", type=int, nargs="+", default=[1, 10, 100], help="Festival counts to measure at")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route at each step")
+    parser.add_argument("--teams", type=int, default=4)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--events", type=int, default=100)
+    parser.add_argument("--completed", type=int, default=50, help="Events that already have a result")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,13 @@ import Scoreboard from './components/Scoreboard';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
 const API = `${BACKEND_URL}/api`;
+// One backend hosts many festivals; pick ours from ?festival= or the build config
+const FESTIVAL = new URLSearchParams(window.location.search).get('festival') || process.env.REACT_APP_FESTIVAL;
 
 // Create axios instance with interceptor
 const apiClient = axios.create({
   baseURL: API,
+  params: FESTIVAL ? { festival: FESTIVAL } : {},
 });
 
 apiClient.interceptors.request.use((config) => {
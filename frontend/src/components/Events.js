@@ -1,11 +1,11 @@
 import React, { useState, useEffect } from 'react';
 import Navigation from './Navigation';
+import MemberSearch from './MemberSearch';
 import { Calendar, Plus, Edit, Trash2, Clock, MapPin, Trophy, Users, Star, Award } from 'lucide-react';
 
 const Events = ({ apiClient, isAdmin, onAdminLogout }) => {
   const [events, setEvents] = useState([]);
   const [teams, setTeams] = useState([]);
-  const [members, setMembers] = useState([]);
   const [results, setResults] = useState([]);
   const [loading, setLoading] = useState(true);
   const [showModal, setShowModal] = useState(false);
@@ -35,16 +35,14 @@ const Events = ({ apiClient, isAdmin, onAdminLogout }) => {
 
   const loadData = async () => {
     try {
-      const [eventsRes, teamsRes, membersRes, resultsRes] = await Promise.all([
+      const [eventsRes, teamsRes, resultsRes] = await Promise.all([
         apiClient.get('/events'),
         apiClient.get('/teams'),
-        apiClient.get('/members'),
         apiClient.get('/results')
       ]);
       
       setEvents(eventsRes.data);
       setTeams(teamsRes.data);
-      setMembers(membersRes.data);
       setResults(resultsRes.data);
     } catch (error) {
       console.error('Error loading data:', error);
@@ -166,18 +164,6 @@ const Events = ({ apiClient, isAdmin, onAdminLogout }) => {
     };
   };
 
-  const getAvailableWinners = () => {
-    if (!selectedEvent) return [];
-    
-    if (selectedEvent.event_type === 'Team') {
-      return teams;
-    } else {
-      return members.filter(member => 
-        selectedEvent.category === 'Mixed' || member.category === selectedEvent.category
-      );
-    }
-  };
-
   const hasResult = (eventId) => {
     return results.some(result => result.event_id === eventId);
   };
@@ -634,37 +620,30 @@ const Events = ({ apiClient, isAdmin, onAdminLogout }) => {
                     <label className="block text-sm font-semibold text-gray-700 mb-2">
                       Winner ({selectedEvent.category === 'Mixed' ? 'Any Category' : selectedEvent.category})
                     </label>
-                    <select
+                    <MemberSearch
+                      apiClient={apiClient}
+                      teams={teams}
+                      category={selectedEvent.category}
                       value={winnerData.winner_member_id}
-                      onChange={(e) => setWinnerData({ ...winnerData, winner_member_id: e.target.value })}
-                      className="form-select"
+                      onChange={(memberId) => setWinnerData({ ...winnerData, winner_member_id: memberId })}
+                      placeholder="Select winner"
                       required
-                    >
-                      <option value="">Select winner</option>
-                      {getAvailableWinners().map((member) => (
-                        <option key={member.id} value={member.id}>
-                          {member.name} ({member.category}) - {teams.find(t => t.id === member.team_id)?.name}
-                        </option>
-                      ))}
-                    </select>
+                    />
                   </div>
 
                   <div>
                     <label className="block text-sm font-semibold text-gray-700 mb-2">
                       Runner-up (Optional)
                     </label>
-                    <select
+                    <MemberSearch
+                      apiClient={apiClient}
+                      teams={teams}
+                      category={selectedEvent.category}
                       value={winnerData.runner_up_member_id}
-                      onChange={(e) => setWinnerData({ ...winnerData, runner_up_member_id: e.target.value })}
-                      className="form-select"
-                    >
-                      <option value="">Select runner-up (optional)</option>
-                      {getAvailableWinners().filter(member => member.id !== winnerData.winner_member_id).map((member) => (
-                        <option key={member.id} value={member.id}>
-                          {member.name} ({member.category}) - {teams.find(t => t.id === member.team_id)?.name}
-                        </option>
-                      ))}
-                    </select>
+                      onChange={(memberId) => setWinnerData({ ...winnerData, runner_up_member_id: memberId })}
+                      excludeId={winnerData.winner_member_id}
+                      placeholder="Select runner-up (optional)"
+                    />
                   </div>
                 </>
               )}
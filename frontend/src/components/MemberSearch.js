@@ -0,0 +1,54 @@
+import React, { useState, useEffect } from 'react';
+
+// Type-ahead member picker: asks the server for a few matching names instead of loading the roster
+const MemberSearch = ({ apiClient, teams, category, value, onChange, excludeId, placeholder, required }) => {
+  const [query, setQuery] = useState('');
+  const [matches, setMatches] = useState([]);
+  const [selected, setSelected] = useState(null);
+
+  useEffect(() => {
+    const timer = setTimeout(async () => {
+      try {
+        const { data } = await apiClient.get('/members/search', {
+          params: { q: query, category: category === 'Mixed' ? undefined : category, limit: 20 }
+        });
+        setMatches(data);
+      } catch (error) {
+        console.error('Error searching members:', error);
+      }
+    }, 150);
+    return () => clearTimeout(timer);
+  }, [query, category]);
+
+  // Keep the chosen member listed while the search moves on
+  const options = selected && selected.id === value && !matches.some(member => member.id === value)
+    ? [selected, ...matches]
+    : matches;
+
+  const handleChange = (e) => {
+    setSelected(options.find(member => member.id === e.target.value) || null);
+    onChange(e.target.value);
+  };
+
+  return (
+    <div className="space-y-2">
+      <input
+        type="search"
+        value={query}
+        onChange={(e) => setQuery(e.target.value)}
+        className="form-input"
+        placeholder="Type a name to search"
+      />
+      <select value={value} onChange={handleChange} className="form-select" required={required}>
+        <option value="">{placeholder}</option>
+        {options.filter(member => member.id !== excludeId).map((member) => (
+          <option key={member.id} value={member.id}>
+            {member.name} ({member.category}) - {teams.find(t => t.id === member.team_id)?.name}
+          </option>
+        ))}
+      </select>
+    </div>
+  );
+};
+
+export default MemberSearch;
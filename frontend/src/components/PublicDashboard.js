@@ -13,21 +13,38 @@ const PublicDashboard = ({ apiClient, isAdmin, onAdminLogin, onAdminLogout }) =>
 
   useEffect(() => {
     loadDashboardData();
+
+    // EventSource reconnects on its own and resumes from the last event id
+    const festival = apiClient.defaults.params?.festival;
+    const liveUrl = `${apiClient.defaults.baseURL}/live${festival ? `?festival=${encodeURIComponent(festival)}` : ''}`;
+    const liveUpdates = new EventSource(liveUrl);
+    const applyResults = (e) => {
+      const { deltas, scoreboard } = JSON.parse(e.data);
+      setScoreboard(scoreboard);
+      if (Object.keys(deltas.members).length > 0) {
+        loadDashboardData();
+      }
+    };
+    liveUpdates.addEventListener('result', applyResults);
+    // A batch of results arrives as one event with the deltas combined
+    liveUpdates.addEventListener('results', applyResults);
+    liveUpdates.addEventListener('event', loadDashboardData);
+    liveUpdates.addEventListener('reconciled', loadDashboardData);
+    liveUpdates.addEventListener('reset', loadDashboardData);
+
+    return () => liveUpdates.close();
   }, []);
 
   const loadDashboardData = async () => {
     try {
-      const [teamsRes, eventsRes, scoreboardRes, rankingsRes] = await Promise.all([
-        apiClient.get('/teams'),
-        apiClient.get('/events'),
-        apiClient.get('/scoreboard'),
-        apiClient.get('/individual-rankings')
-      ]);
+      const { data } = await apiClient.get('/dashboard', {
+        params: { include: 'teams,events,scoreboard,individual_rankings' }
+      });
       
-      setTeams(teamsRes.data);
-      setEvents(eventsRes.data);
-      setScoreboard(scoreboardRes.data);
-      setIndividualRankings(rankingsRes.data);
+      setTeams(data.teams);
+      setEvents(data.events);
+      setScoreboard(data.scoreboard);
+      setIndividualRankings(data.individual_rankings);
     } catch (error) {
       console.error('Error loading dashboard data:', error);
     } finally {
@@ -4,8 +4,7 @@ import { Award, Crown, Medal, Trophy, TrendingUp, Users } from 'lucide-react';
 
 const Scoreboard = ({ apiClient, onLogout }) => {
   const [scoreboard, setScoreboard] = useState([]);
-  const [teams, setTeams] = useState([]);
-  const [members, setMembers] = useState([]);
+  const [totalMembers, setTotalMembers] = useState(0);
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
@@ -14,15 +13,11 @@ const Scoreboard = ({ apiClient, onLogout }) => {
 
   const loadData = async () => {
     try {
-      const [scoreboardRes, teamsRes, membersRes] = await Promise.all([
-        apiClient.get('/scoreboard'),
-        apiClient.get('/teams'),
-        apiClient.get('/members')
-      ]);
+      // Member counts and shares come precomputed per team, so the roster stays on the server
+      const { data } = await apiClient.get('/team-stats');
       
-      setScoreboard(scoreboardRes.data);
-      setTeams(teamsRes.data);
-      setMembers(membersRes.data);
+      setScoreboard(data.teams);
+      setTotalMembers(data.total_members);
     } catch (error) {
       console.error('Error loading scoreboard:', error);
     } finally {
@@ -30,10 +25,6 @@ const Scoreboard = ({ apiClient, onLogout }) => {
     }
   };
 
-  const getMembersByTeam = (teamId) => {
-    return members.filter(member => member.team_id === teamId);
-  };
-
   const getRankIcon = (index) => {
     switch (index) {
       case 0:
@@ -112,13 +103,13 @@ const Scoreboard = ({ apiClient, onLogout }) => {
             <div className="mt-6 flex items-center justify-center space-x-8">
               <div className="text-center">
                 <div className="text-2xl font-bold text-gray-700">
-                  {getMembersByTeam(leadingTeam.id).length}
+                  {leadingTeam.members.total}
                 </div>
                 <div className="text-sm text-gray-600">Members</div>
               </div>
               <div className="text-center">
                 <div className="text-2xl font-bold text-green-600">
-                  {totalPoints > 0 ? Math.round((leadingTeam.total_points / totalPoints) * 100) : 0}%
+                  {Math.round(leadingTeam.share * 100)}%
                 </div>
                 <div className="text-sm text-gray-600">Share</div>
               </div>
@@ -129,9 +120,6 @@ const Scoreboard = ({ apiClient, onLogout }) => {
         {/* Scoreboard */}
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
           {scoreboard.map((team, index) => {
-            const teamMembers = getMembersByTeam(team.id);
-            const adultMembers = teamMembers.filter(m => m.category === 'Adult');
-            const kidMembers = teamMembers.filter(m => m.category === 'Kid');
             const isWinner = index === 0;
 
             return (
@@ -171,17 +159,18 @@ const Scoreboard = ({ apiClient, onLogout }) => {
                       <div className="flex items-center space-x-4 text-sm text-gray-600">
                         <div className="flex items-center">
                           <Users className="w-4 h-4 mr-1" />
-                          {teamMembers.length} total
+                          {team.members.total} total
                         </div>
-                        <div>{adultMembers.length} adults</div>
-                        <div>{kidMembers.length} kids</div>
+                        <div>{team.members.Adult} adults</div>
+                        <div>{team.members.Kid} kids</div>
+                        <div>{team.events_won} wins</div>
                       </div>
                       
                       {totalPoints > 0 && (
                         <div className="flex items-center space-x-2">
                           <TrendingUp className="w-4 h-4 text-green-500" />
                           <span className="text-sm font-semibold text-green-600">
-                            {Math.round((team.total_points / totalPoints) * 100)}%
+                            {Math.round(team.share * 100)}%
                           </span>
                         </div>
                       )}
@@ -218,7 +207,7 @@ const Scoreboard = ({ apiClient, onLogout }) => {
             <div className="w-16 h-16 bg-gradient-to-br from-green-500 to-teal-500 rounded-full flex items-center justify-center mx-auto mb-4">
               <Users className="w-8 h-8 text-white" />
             </div>
-            <h3 className="text-2xl font-bold text-green-700">{members.length}</h3>
+            <h3 className="text-2xl font-bold text-green-700">{totalMembers}</h3>
             <p className="text-green-600">Total Participants</p>
           </div>
 
@@ -226,7 +215,7 @@ const Scoreboard = ({ apiClient, onLogout }) => {
             <div className="w-16 h-16 bg-gradient-to-br from-purple-500 to-pink-500 rounded-full flex items-center justify-center mx-auto mb-4">
               <Award className="w-8 h-8 text-white" />
             </div>
-            <h3 className="text-2xl font-bold text-purple-700">{teams.length}</h3>
+            <h3 className="text-2xl font-bold text-purple-700">{scoreboard.length}</h3>
             <p className="text-purple-600">Competing Teams</p>
           </div>
         </div>
@@ -18,6 +18,10 @@ const Winners = ({ apiClient, onLogout }) => {
     winner_points: 10,
     runner_up_points: 5
   });
+  // One key per result entry, so a double submit or retry records it only once
+  const [idempotencyKey, setIdempotencyKey] = useState(() => crypto.randomUUID());
+  // Results entered back to back are sent together in one batch request
+  const [queuedResults, setQueuedResults] = useState([]);
 
   useEffect(() => {
     loadData();
@@ -25,21 +29,18 @@ const Winners = ({ apiClient, onLogout }) => {
 
   const loadData = async () => {
     try {
-      const [eventsRes, teamsRes, resultsRes, configRes] = await Promise.all([
-        apiClient.get('/events'),
-        apiClient.get('/teams'),
-        apiClient.get('/results'),
-        apiClient.get('/points-config')
-      ]);
+      const { data } = await apiClient.get('/dashboard', {
+        params: { include: 'events,teams,results,points_config' }
+      });
       
-      setEvents(eventsRes.data);
-      setTeams(teamsRes.data);
-      setResults(resultsRes.data);
-      setPointsConfig(configRes.data);
+      setEvents(data.events);
+      setTeams(data.teams);
+      setResults(data.results);
+      setPointsConfig(data.points_config);
       setNewResult(prev => ({
         ...prev,
-        winner_points: configRes.data.winner_points,
-        runner_up_points: configRes.data.runner_up_points
+        winner_points: data.points_config.winner_points,
+        runner_up_points: data.points_config.runner_up_points
       }));
     } catch (error) {
       console.error('Error loading data:', error);
@@ -48,19 +49,26 @@ const Winners = ({ apiClient, onLogout }) => {
     }
   };
 
+  const resetNewResult = () => {
+    setNewResult({
+      event_id: '',
+      winner_team_id: '',
+      runner_up_team_id: '',
+      remarks: '',
+      winner_points: pointsConfig.winner_points,
+      runner_up_points: pointsConfig.runner_up_points
+    });
+  };
+
   const handleSubmitResult = async (e) => {
     e.preventDefault();
     
     try {
-      await apiClient.post('/results', newResult);
-      setNewResult({
-        event_id: '',
-        winner_team_id: '',
-        runner_up_team_id: '',
-        remarks: '',
-        winner_points: pointsConfig.winner_points,
-        runner_up_points: pointsConfig.runner_up_points
+      await apiClient.post('/results', newResult, {
+        headers: { 'Idempotency-Key': idempotencyKey }
       });
+      setIdempotencyKey(crypto.randomUUID());
+      resetNewResult();
       setShowModal(false);
       loadData();
     } catch (error) {
@@ -68,6 +76,28 @@ const Winners = ({ apiClient, onLogout }) => {
     }
   };
 
+  const handleQueueResult = (e) => {
+    const form = e.currentTarget.form;
+    if (!form.reportValidity()) {
+      return;
+    }
+    setQueuedResults(prev => [...prev, newResult]);
+    resetNewResult();
+  };
+
+  const handleSubmitQueued = async () => {
+    try {
+      const { data } = await apiClient.post('/results/batch', queuedResults);
+      // Keep the entries that were not recorded so they can be fixed and resent
+      const failed = data.results.filter(outcome => outcome.status !== 'created');
+      failed.forEach(outcome => console.error(`Result for ${getEventName(outcome.event_id)} not recorded: ${outcome.detail}`));
+      setQueuedResults(failed.map(outcome => queuedResults[outcome.index]));
+      loadData();
+    } catch (error) {
+      console.error('Error adding results:', error);
+    }
+  };
+
   const handleUpdateConfig = async (e) => {
     e.preventDefault();
     
@@ -95,7 +125,8 @@ const Winners = ({ apiClient, onLogout }) => {
   };
 
   const eventsWithoutResults = events.filter(event => 
-    !results.some(result => result.event_id === event.id)
+    !results.some(result => result.event_id === event.id) &&
+    !queuedResults.some(result => result.event_id === event.id)
   );
 
   if (loading) {
@@ -127,6 +158,15 @@ const Winners = ({ apiClient, onLogout }) => {
               <Settings size={20} />
               <span>Points Config</span>
             </button>
+            {queuedResults.length > 0 && (
+              <button
+                onClick={handleSubmitQueued}
+                className="btn-secondary flex items-center space-x-2"
+              >
+                <Trophy size={20} />
+                <span>Submit Queued ({queuedResults.length})</span>
+              </button>
+            )}
             <button
               onClick={() => setShowModal(true)}
               className="btn-onam flex items-center space-x-2"
@@ -403,6 +443,13 @@ const Winners = ({ apiClient, onLogout }) => {
                 >
                   Cancel
                 </button>
+                <button
+                  type="button"
+                  onClick={handleQueueResult}
+                  className="btn-secondary flex-1"
+                >
+                  Queue & Next
+                </button>
                 <button
                   type="submit"
                   className="btn-onam flex-1"
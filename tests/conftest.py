@@ -0,0 +1,77 @@
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+# The API runs on the in-process storage engine; nothing here needs MongoDB
+os.environ.setdefault("STORAGE_ENGINE", "memory")
+os.environ.setdefault("AUTO_CREATE_INDEXES", "true")
+os.environ.setdefault("MEDIA_ROOT", tempfile.mkdtemp(prefix="heightsonam-media-"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+
+@pytest.fixture(scope="session")
+def server():
+    import server
+
+    return server
+
+
+@pytest.fixture(scope="session")
+def client(server):
+    from fastapi.testclient import TestClient
+
+    with TestClient(server.app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    response = client.post("/api/auth/login", json={"username": "admin", "password": "admin123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def festival(client, admin_headers):
+    """A fresh festival with two teams, so tests never see each other's points."""
+    headers = {**admin_headers, "X-Festival": f"test-{uuid.uuid4().hex[:12]}"}
+    for name in ("Team A", "Team B"):
+        client.post("/api/teams", json={"name": name, "color": "#000000"}, headers=headers)
+    return headers
+
+
+def create_team_event(client, headers):
+    response = client.post("/api/events", json={
+        "name": "Tug of War",
+        "description": "Finals",
+        "event_date": "2025-09-01T10:00:00",
+        "category": "Adult",
+        "event_type": "Team"
+    }, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def team_points(client, headers):
+    return {team["id"]: team["total_points"] for team in client.get("/api/teams", headers=headers).json()}
+
+
+def result_for(client, headers):
+    """A result for a new team event of the festival: first team wins, second runs up."""
+    event = create_team_event(client, headers)
+    winner, runner_up = team_points(client, headers)
+    return {"event_id": event["id"], "winner_team_id": winner, "runner_up_team_id": runner_up}
+
+
+# Helpers shared by test modules, handed out as fixtures so modules never import each other
+@pytest.fixture(name="team_points")
+def team_points_fixture():
+    return team_points
+
+
+@pytest.fixture(name="result_for")
+def result_for_fixture():
+    return result_for
@@ -0,0 +1,44 @@
+import uuid
+
+
+def scoped_admin(client, admin_headers, festivals):
+    username = f"admin-{uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/api/admin/accounts",
+        json={"username": username, "password": "secret", "festivals": festivals},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+    login = client.post("/api/auth/login", json={"username": username, "password": "secret"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_scoped_admin_writes_only_to_its_festivals(client, admin_headers, festival):
+    headers = scoped_admin(client, admin_headers, [festival["X-Festival"]])
+    team = {"name": "Team C", "color": "#000000"}
+
+    own = client.post("/api/teams", json=team, headers={**headers, "X-Festival": festival["X-Festival"]})
+    other = client.post("/api/teams", json=team, headers={**headers, "X-Festival": "someone-else"})
+    by_query = client.post("/api/teams", params={"festival": "someone-else"}, json=team, headers=headers)
+    default = client.post("/api/teams", json=team, headers=headers)
+
+    assert own.status_code == 200
+    assert [other.status_code, by_query.status_code, default.status_code] == [403, 403, 403]
+    assert client.get("/api/teams", headers={"X-Festival": "someone-else"}).json() == []
+
+
+def test_deployment_operations_need_an_unscoped_admin(client, admin_headers, festival):
+    headers = scoped_admin(client, admin_headers, [festival["X-Festival"]])
+
+    assert client.post("/api/admin/reconcile", headers=headers).status_code == 403
+    assert client.get("/api/admin/indexes", headers=headers).status_code == 403
+    assert client.post(
+        "/api/admin/accounts", json={"username": "escalated", "password": "x"}, headers=headers
+    ).status_code == 403
+    assert client.get("/api/admin/indexes", headers=admin_headers).status_code == 200
+
+
+def test_admin_usernames_are_unique(client, admin_headers):
+    response = client.post("/api/admin/accounts", json={"username": "admin", "password": "x"}, headers=admin_headers)
+
+    assert response.status_code == 409
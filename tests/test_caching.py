@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+
+
+def test_write_on_another_worker_changes_the_etag(client, festival, server, monkeypatch):
+    monkeypatch.setattr(server.read_cache, "version_ttl_seconds", 0)
+    first = client.get("/api/teams", headers=festival)
+    etag = first.headers["ETag"]
+    assert client.get("/api/teams", headers={**festival, "If-None-Match": etag}).status_code == 304
+
+    # Another worker stores a team and bumps the shared version; this worker's cache never saw it
+    async def write_elsewhere():
+        await server.store.teams.insert_one({
+            "id": "elsewhere", "festival_id": festival["X-Festival"], "name": "Team C", "color": "#000000",
+            "total_points": 0, "created_at": "2025-09-01T10:00:00+00:00"
+        })
+        await server.store.versions.update_one(
+            {"_id": festival["X-Festival"]}, {"$inc": {"versions.teams": 1}, "$set": {"modified.teams": 0}}
+        )
+
+    asyncio.run(write_elsewhere())
+    response = client.get("/api/teams", headers={**festival, "If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json()) == len(first.json()) + 1
+
+
+def test_etag_is_stable_across_reads(client, festival):
+    etags = {client.get("/api/scoreboard", headers=festival).headers["ETag"] for _ in range(3)}
+
+    assert len(etags) == 1
+
+
+def test_concurrent_reads_after_a_write_share_one_query_per_collection(server, client, festival, monkeypatch):
+    calls = {"versions": 0, "teams": 0}
+
+    def counted(repository, name):
+        method = getattr(repository, name)
+
+        async def slow(*args, **kwargs):
+            calls[repository.name] += 1
+            await asyncio.sleep(0.02)
+            return await method(*args, **kwargs)
+
+        monkeypatch.setattr(repository, name, slow)
+
+    async def scenario():
+        await server.read_cache.invalidate(festival["X-Festival"], "teams")
+        counted(server.store.versions, "find_one")
+        counted(server.store.teams, "find")
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*(async_client.get("/api/scoreboard", headers=festival) for _ in range(100)))
+
+    responses = asyncio.run(scenario())
+
+    assert {response.status_code for response in responses} == {200}
+    assert len({response.headers["ETag"] for response in responses}) == 1
+    assert calls == {"versions": 1, "teams": 1}
+
+
+def test_versioned_bodies_are_compressed_once_per_encoding(server, client, festival, monkeypatch):
+    for number in range(40):
+        client.post("/api/teams", json={"name": f"Team {number:02}", "color": "#000000"}, headers=festival)
+    compress = server.compress
+    calls = []
+
+    def counted(body, coding):
+        calls.append(coding)
+        return compress(body, coding)
+
+    monkeypatch.setattr(server, "compress", counted)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(*(
+                async_client.get("/api/teams", headers={**festival, "Accept-Encoding": coding})
+                for coding in ["gzip"] * 20 + ["br"] * 20
+            ))
+
+    responses = asyncio.run(scenario())
+    later = client.get("/api/teams", headers={**festival, "Accept-Encoding": "gzip"})
+
+    assert {response.headers["Content-Encoding"] for response in responses} == {"gzip", "br"}
+    assert len({response.content for response in responses}) == 1
+    assert later.json() == responses[0].json()
+    assert sorted(calls) == ["br", "gzip"]
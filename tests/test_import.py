@@ -0,0 +1,71 @@
+def upload(client, festival, kind, text):
+    response = client.post(
+        f"/api/import/{kind}", content=text.encode(), headers={**festival, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def names(client, festival, kind):
+    return sorted(document["name"] for document in client.get(f"/api/{kind}", headers=festival).json())
+
+
+def test_crlf_line_endings(client, festival):
+    report = upload(client, festival, "teams", "\ufeffname,color\r\nTeam C,#111111\r\nTeam D,#222222\r\n")
+
+    assert (report["received"], report["inserted"], report["errors"]) == (2, 2, [])
+    assert names(client, festival, "teams") == ["Team A", "Team B", "Team C", "Team D"]
+
+
+def test_quoted_commas_and_newlines(client, festival):
+    report = upload(client, festival, "events", (
+        "name,description,event_date,category,event_type\r\n"
+        '"Tug, of War","Finals\r\n""Heavyweight"", evening",2025-09-01T10:00:00,Adult,Team\r\n'
+        "Sack Race,Heats,2025-09-01T11:00:00,Kid,Individual\r\n"
+    ))
+
+    assert (report["received"], report["inserted"], report["errors"]) == (2, 2, [])
+    events = {event["name"]: event for event in client.get("/api/events", headers=festival).json()}
+    assert events["Tug, of War"]["description"] == 'Finals\r\n"Heavyweight", evening'
+    assert events["Sack Race"]["category"] == "Kid"
+
+
+def test_stray_quote_in_an_unquoted_cell_is_literal(client, festival):
+    report = upload(client, festival, "teams", 'name,color\nThe 5" Team,#111111\nTeam D,#222222\n')
+
+    assert (report["received"], report["inserted"], report["errors"]) == (2, 2, [])
+    assert names(client, festival, "teams") == ["Team A", "Team B", "Team D", 'The 5" Team']
+
+
+def test_unterminated_quoted_field(client, festival):
+    report = upload(client, festival, "teams", 'name,color\nTeam C,#111111\n"Team D,#222222\nTeam E,#333333\n')
+
+    assert report["inserted"] == 1
+    assert report["errors"] == [{"row": 2, "errors": ["Unterminated quoted field"]}]
+
+
+def test_column_count_errors_skip_only_their_row(client, festival):
+    report = upload(client, festival, "teams", "name,color\nTeam C,#111111,extra\nTeam D\nTeam E,#333333\n")
+
+    assert report["inserted"] == 1
+    assert report["errors"] == [
+        {"row": 1, "errors": ["Expected 2 columns, got 3"]},
+        {"row": 2, "errors": ["Expected 2 columns, got 1"]}
+    ]
+    assert names(client, festival, "teams") == ["Team A", "Team B", "Team E"]
+
+
+def test_members_resolve_team_names(client, festival):
+    team_ids = {team["name"]: team["id"] for team in client.get("/api/teams", headers=festival).json()}
+
+    report = upload(client, festival, "members", (
+        "name,category,team\n"
+        "Anu,Adult,Team A\n"
+        "Biju,Kid,Team B\n"
+        "Chitra,Adult,Team Z\n"
+    ))
+
+    assert report["inserted"] == 2
+    assert report["errors"] == [{"row": 3, "errors": ["team: Unknown team Team Z"]}]
+    members = {member["name"]: member["team_id"] for member in client.get("/api/members", headers=festival).json()}
+    assert members == {"Anu": team_ids["Team A"], "Biju": team_ids["Team B"]}
@@ -0,0 +1,11 @@
+def test_in_flight_requests_are_labelled_by_route(client):
+    client.get("/api/teams")
+    client.get("/api/teams/some-team/no-such-page")
+
+    lines = client.get("/metrics").text.splitlines()
+
+    assert 'http_requests_in_flight{method="GET",route="/api/teams"} 0' in lines
+    assert 'http_requests_in_flight{method="GET",route="unmatched"} 0' in lines
+    # The scrape itself is still being served
+    assert 'http_requests_in_flight{method="GET",route="/metrics"} 1' in lines
+    assert any(line.startswith('http_requests_total{method="GET",route="/api/teams",') for line in lines)
@@ -0,0 +1,21 @@
+def test_retroactive_config_keeps_hand_entered_points(client, festival, result_for, team_points):
+    default = result_for(client, festival)
+    custom = {**result_for(client, festival), "winner_points": 9, "runner_up_points": 1}
+    for body in (default, custom):
+        assert client.post("/api/results", json=body, headers=festival).status_code == 200
+
+    response = client.put(
+        "/api/points-config",
+        params={"retroactive": "true"},
+        json={"winner_points": 20, "runner_up_points": 8},
+        headers=festival
+    )
+
+    assert response.status_code == 200
+    points = {
+        result["event_id"]: (result["winner_points"], result["runner_up_points"])
+        for result in client.get("/api/results", headers=festival).json()
+    }
+    assert points == {default["event_id"]: (20, 8), custom["event_id"]: (9, 1)}
+    totals = team_points(client, festival)
+    assert (totals[default["winner_team_id"]], totals[default["runner_up_team_id"]]) == (29, 9)
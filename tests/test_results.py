@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+
+def test_idempotent_retry_returns_the_original_result(client, festival, result_for, team_points):
+    body = result_for(client, festival)
+    headers = {**festival, "Idempotency-Key": "retry-1"}
+
+    first = client.post("/api/results", json=body, headers=headers)
+    points = team_points(client, festival)
+    retry = client.post("/api/results", json=body, headers=headers)
+
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.json()["id"] == first.json()["id"]
+    assert team_points(client, festival) == points
+    assert len(client.get("/api/results", headers=festival).json()) == 1
+
+
+def test_second_result_for_an_event_conflicts(client, festival, result_for, team_points):
+    body = result_for(client, festival)
+
+    assert client.post("/api/results", json=body, headers=festival).status_code == 200
+    points = team_points(client, festival)
+    second = client.post("/api/results", json=body, headers=festival)
+
+    assert second.status_code == 409
+    assert team_points(client, festival) == points
+    assert len(client.get("/api/results", headers=festival).json()) == 1
+
+
+def test_missing_event_is_not_found(client, festival):
+    response = client.post("/api/results", json={"event_id": "no-such-event"}, headers=festival)
+
+    assert response.status_code == 404
+
+
+def test_failed_bulk_write_undoes_the_result(client, festival, server, monkeypatch, result_for, team_points):
+    body = result_for(client, festival)
+    bulk_update = server.store.teams.bulk_update
+    failures = [BulkWriteError]
+
+    async def fail_after_first(operations, ordered=True, session=None):
+        # Apply the first increment, then fail the second like an ordered bulk write would
+        if failures and len(operations) > 1:
+            failures.pop()
+            await bulk_update(operations[:1], ordered=ordered, session=session)
+            raise BulkWriteError({"writeErrors": [{"index": 1, "code": 2, "errmsg": "injected"}]})
+        return await bulk_update(operations, ordered=ordered, session=session)
+
+    monkeypatch.setattr(server.store.teams, "bulk_update", fail_after_first)
+
+    with pytest.raises(BulkWriteError):
+        client.post("/api/results", json=body, headers=festival)
+
+    monkeypatch.undo()
+    assert set(team_points(client, festival).values()) == {0}
+    assert client.get("/api/results", headers=festival).json() == []
+    events = client.get("/api/events", headers=festival).json()
+    assert [event["is_completed"] for event in events] == [False]
+
+    # The released event takes a result again
+    assert client.post("/api/results", json=body, headers=festival).status_code == 200
+    assert sorted(team_points(client, festival).values()) == [5, 10]
+
+
+def test_reconcile_between_insert_and_increments_does_not_double_count(
+    client, festival, server, monkeypatch, result_for, team_points
+):
+    body = result_for(client, festival)
+    bulk_update = server.store.teams.bulk_update
+    reports = []
+
+    async def reconcile_first(operations, ordered=True, session=None):
+        # The result is stored but its points are not applied yet
+        if not reports:
+            reports.append(await server.reconcile_scores(full=True, festival=festival["X-Festival"]))
+        return await bulk_update(operations, ordered=ordered, session=session)
+
+    monkeypatch.setattr(server.store.teams, "bulk_update", reconcile_first)
+
+    assert client.post("/api/results", json=body, headers=festival).status_code == 200
+    assert reports[0]["corrections"] == []
+    assert reports[0]["skipped"] == 2
+    assert sorted(team_points(client, festival).values()) == [5, 10]
+    assert client.post("/api/admin/reconcile", params={"full": "true"}, headers=festival).json()["corrections"] == []
+
+
+def test_failed_batch_bulk_write_undoes_every_result(client, festival, server, monkeypatch, result_for, team_points):
+    bodies = [result_for(client, festival) for _ in range(2)]
+    bulk_update = server.store.teams.bulk_update
+    failures = [BulkWriteError]
+
+    async def fail_after_first(operations, ordered=True, session=None):
+        if failures and len(operations) > 1:
+            failures.pop()
+            await bulk_update(operations[:1], ordered=ordered, session=session)
+            raise BulkWriteError({"writeErrors": [{"index": 1, "code": 2, "errmsg": "injected"}]})
+        return await bulk_update(operations, ordered=ordered, session=session)
+
+    monkeypatch.setattr(server.store.teams, "bulk_update", fail_after_first)
+
+    with pytest.raises(BulkWriteError):
+        client.post("/api/results/batch", json=bodies, headers=festival)
+
+    monkeypatch.undo()
+    assert set(team_points(client, festival).values()) == {0}
+    assert client.get("/api/results", headers=festival).json() == []
+    assert not any(event["is_completed"] for event in client.get("/api/events", headers=festival).json())
+
+
+def test_incremental_reconcile_finds_backdated_results(client, festival, server, result_for, team_points):
+    client.post("/api/admin/reconcile", headers=festival)
+    body = {**result_for(client, festival), "created_at": "2020-01-01T00:00:00+00:00"}
+    assert client.post("/api/results", json=body, headers=festival).status_code == 200
+    asyncio.run(server.store.teams.update_one({"id": body["winner_team_id"]}, {"$inc": {"total_points": 7}}))
+
+    report = client.post("/api/admin/reconcile", headers=festival).json()
+
+    assert report["mode"] == "incremental"
+    assert [(c["id"], c["before"], c["after"]) for c in report["corrections"]] == [(body["winner_team_id"], 17, 10)]
+    assert team_points(client, festival)[body["winner_team_id"]] == 10
+
+
+def test_watermark_stops_before_in_flight_results(client, festival, server, monkeypatch, result_for):
+    monkeypatch.setattr(server, "RECONCILE_OVERLAP_SECONDS", 0)
+    body, later = result_for(client, festival), result_for(client, festival)
+    bulk_update = server.store.teams.bulk_update
+    reports = []
+
+    async def reconcile_first(operations, ordered=True, session=None):
+        if not reports:
+            reports.append(None)
+            # Another result is stored after this one while this one's points are still pending
+            await server.record_result(server.Result(**later, festival_id=festival["X-Festival"]))
+            reports[0] = await server.reconcile_scores()
+        return await bulk_update(operations, ordered=ordered, session=session)
+
+    monkeypatch.setattr(server.store.teams, "bulk_update", reconcile_first)
+    assert client.post("/api/results", json=body, headers=festival).status_code == 200
+
+    async def recorded():
+        result = await server.store.results.find_one({"event_id": body["event_id"]})
+        watermark = await server.store.reconciliation.find_one({"_id": "watermark"})
+        return result["recorded_at"], watermark["recorded_at"]
+
+    recorded_at, watermark = asyncio.run(recorded())
+    assert reports[0]["skipped"] == 2
+    assert watermark <= recorded_at
@@ -0,0 +1,23 @@
+def test_search_matches_a_prefix_of_any_case(client, festival, team_points):
+    team_id = next(iter(team_points(client, festival)))
+    for name in ("Anil Kumar", "anitha", "Bindu"):
+        response = client.post("/api/members", json={"name": name, "category": "Adult", "team_id": team_id}, headers=festival)
+        assert response.status_code == 200
+
+    response = client.get("/api/members/search", params={"q": "AN"}, headers=festival)
+
+    assert [member["name"] for member in response.json()] == ["Anil Kumar", "anitha"]
+
+
+def test_search_does_not_fill_the_read_cache(client, festival, server):
+    client.get("/api/teams", headers=festival)
+    entries = len(server.read_cache._entries)
+
+    for prefix in ("a", "an", "ani", "anil", "b", "bi"):
+        assert client.get("/api/members/search", params={"q": prefix}, headers=festival).status_code == 200
+
+    assert len(server.read_cache._entries) == entries
+    # The hot entry is still cached
+    hits = server.read_cache.hits.get("teams", 0)
+    client.get("/api/teams", headers=festival)
+    assert server.read_cache.hits["teams"] == hits + 1
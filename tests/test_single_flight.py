@@ -0,0 +1,115 @@
+import asyncio
+
+import httpx
+import pytest
+
+
+def test_followers_share_the_leaders_result(server):
+    flights = server.SingleFlight(max_wait_seconds=1)
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.02)
+        return object()
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do("key", work) for _ in range(10)))
+
+    values = asyncio.run(scenario())
+
+    assert len(runs) == 1
+    assert len({id(value) for value in values}) == 1
+    assert flights.stats() == {"max_wait_seconds": 1, "in_flight": 0, "leaders": 1, "followers": 9, "timeouts": 0}
+
+
+def test_different_keys_do_not_share(server):
+    flights = server.SingleFlight(max_wait_seconds=1)
+
+    async def scenario():
+        return await asyncio.gather(*(flights.do(key, lambda key=key: asyncio.sleep(0.01, key)) for key in "abc"))
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+    assert flights.leaders == 3
+
+
+def test_follower_runs_the_work_itself_after_the_wait(server):
+    flights = server.SingleFlight(max_wait_seconds=0.01)
+    runs = []
+
+    async def work():
+        runs.append(len(runs) + 1)
+        run = runs[-1]
+        await asyncio.sleep(0.1 if run == 1 else 0)
+        return run
+
+    async def scenario():
+        leader = asyncio.ensure_future(flights.do("key", work))
+        await asyncio.sleep(0)
+        follower = await flights.do("key", work)
+        return await leader, follower
+
+    assert asyncio.run(scenario()) == (1, 2)
+    assert flights.timeouts == 1
+
+
+def test_errors_reach_every_caller_and_clear_the_flight(server):
+    flights = server.SingleFlight(max_wait_seconds=1)
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database down")
+
+    async def scenario():
+        outcomes = await asyncio.gather(*(flights.do("key", failing) for _ in range(3)), return_exceptions=True)
+        # The failed flight is gone, so the next call runs again
+        retry = await flights.do("key", lambda: asyncio.sleep(0, "recovered"))
+        return outcomes, retry
+
+    outcomes, retry = asyncio.run(scenario())
+
+    assert [str(outcome) for outcome in outcomes] == ["database down"] * 3
+    assert retry == "recovered"
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_cancelled_leader_does_not_cancel_followers(server):
+    flights = server.SingleFlight(max_wait_seconds=1)
+
+    async def scenario():
+        leader = asyncio.ensure_future(flights.do("key", lambda: asyncio.sleep(0.02, "done")))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do("key", lambda: asyncio.sleep(0, "own")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_concurrent_public_reads_make_one_store_call(server, client, festival, monkeypatch):
+    calls = []
+    find = server.store.teams.find
+
+    async def slow_find(*args, **kwargs):
+        calls.append(args)
+        await asyncio.sleep(0.02)
+        return await find(*args, **kwargs)
+
+    async def scenario():
+        await server.read_cache.invalidate(festival["X-Festival"], "teams")
+        monkeypatch.setattr(server.store.teams, "find", slow_find)
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            return await asyncio.gather(
+                *(async_client.get("/api/scoreboard", headers=festival) for _ in range(50)),
+                *(async_client.get("/api/dashboard", params={"include": "teams"}, headers=festival) for _ in range(50))
+            )
+
+    responses = asyncio.run(scenario())
+
+    assert {response.status_code for response in responses} == {200}
+    # One load per distinct loader: the scoreboard and the dashboard's team list
+    assert len(calls) == 2
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+import time
+
+import orjson
+
+
+def test_concurrent_publications_of_a_festival_are_serialized(server, client, festival, tmp_path, monkeypatch):
+    publisher = server.SnapshotPublisher(tmp_path, server.SNAPSHOTS, debounce_seconds=0)
+    write_snapshot = server.write_snapshot
+    lock = threading.Lock()
+    writers = {"active": 0, "most": 0}
+
+    def tracked_write(path, data):
+        with lock:
+            writers["active"] += 1
+            writers["most"] = max(writers["most"], writers["active"])
+        try:
+            time.sleep(0.01)
+            write_snapshot(path, data)
+        finally:
+            with lock:
+                writers["active"] -= 1
+
+    monkeypatch.setattr(server, "write_snapshot", tracked_write)
+    name = festival["X-Festival"]
+
+    async def publish_together():
+        # A debounced publication and forced republishes at the same moment
+        publisher.notify(name, ["teams"])
+        await asyncio.gather(*(publisher.publish(name) for _ in range(3)))
+        await publisher.drain()
+
+    asyncio.run(publish_together())
+
+    assert writers["most"] == 1
+    manifest = orjson.loads((tmp_path / name / "manifest.json").read_bytes())
+    assert set(manifest["files"]) == set(server.SNAPSHOTS)
+    assert not list((tmp_path / name).glob(".*.tmp"))
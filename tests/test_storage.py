@@ -0,0 +1,240 @@
+import asyncio
+
+import pytest
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from storage import MemoryStore
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+@pytest.fixture
+def store():
+    return MemoryStore()
+
+
+async def seed(repository, *documents):
+    for document in documents:
+        await repository.insert_one(document)
+
+
+def test_find_matches_operators(store):
+    async def scenario():
+        await seed(
+            store.members,
+            {"id": "a", "category": "Adult", "individual_points": 10, "team_id": "t1"},
+            {"id": "b", "category": "Kid", "individual_points": 5, "team_id": "t2"},
+            {"id": "c", "category": "Adult", "individual_points": None},
+            {"id": "d", "category": "Adult"}
+        )
+
+        async def ids(query):
+            return sorted(member["id"] for member in await store.members.find(query, {"_id": 0, "id": 1}))
+
+        assert await ids({"category": "Adult"}) == ["a", "c", "d"]
+        assert await ids({"id": {"$in": ["a", "b", "x"]}}) == ["a", "b"]
+        assert await ids({"id": {"$nin": ["a", "b"]}}) == ["c", "d"]
+        assert await ids({"category": {"$ne": "Adult"}}) == ["b"]
+        assert await ids({"individual_points": {"$gt": 5}}) == ["a"]
+        assert await ids({"individual_points": {"$gte": 5, "$lt": 10}}) == ["b"]
+        # Null and missing both equal None, but range operators skip them
+        assert await ids({"individual_points": None}) == ["c", "d"]
+        assert await ids({"individual_points": {"$lte": 100}}) == ["a", "b"]
+        assert await ids({"team_id": {"$exists": False}}) == ["c", "d"]
+        assert await ids({"individual_points": {"$type": "int"}}) == ["a", "b"]
+        assert await ids({"$or": [{"id": "a"}, {"category": "Kid"}]}) == ["a", "b"]
+        assert await ids({"$and": [{"category": "Adult"}, {"individual_points": {"$exists": True}}]}) == ["a", "c"]
+        assert await store.members.count({"category": "Adult"}) == 3
+        assert (await store.members.find_one({"id": "b"}, {"_id": 0, "team_id": 1})) == {"team_id": "t2"}
+        assert await store.members.find_one({"id": "x"}) is None
+
+    run(scenario())
+
+
+def test_updates(store):
+    async def scenario():
+        await seed(store.teams, {"id": "t1", "total_points": 10, "logo": {"size": 64}})
+
+        assert await store.teams.update_one({"id": "t1"}, {"$inc": {"total_points": 5, "wins": 1}}) == 1
+        assert await store.teams.update_one({"id": "x"}, {"$inc": {"total_points": 5}}) == 0
+        await store.teams.update_one({"id": "t1"}, {"$set": {"logo.size": 128, "totals.t2": 3}})
+        await store.teams.update_one({"id": "t1"}, {"$unset": {"color": "", "wins": ""}})
+        before = await store.teams.find_one_and_update({"id": "t1"}, {"$inc": {"total_points": -15}})
+
+        assert before["total_points"] == 15
+        assert await store.teams.find_one({"id": "t1"}, {"_id": 0}) == {
+            "id": "t1", "total_points": 0, "logo": {"size": 128}, "totals": {"t2": 3}
+        }
+
+    run(scenario())
+
+
+def test_update_many_and_bulk_update(store):
+    async def scenario():
+        await seed(store.events, *({"id": f"e{n}", "is_completed": False} for n in range(3)))
+
+        assert await store.events.update_many({"id": {"$in": ["e0", "e1"]}}, {"$set": {"is_completed": True}}) == 2
+        assert await store.events.count({"is_completed": True}) == 2
+        # Compare-and-set: operations whose filter no longer matches are not counted
+        matched = await store.events.bulk_update([
+            ({"id": "e0", "is_completed": True}, {"$set": {"is_completed": False}}),
+            ({"id": "e2", "is_completed": True}, {"$set": {"is_completed": False}})
+        ], ordered=False)
+        assert matched == 1
+        assert await store.events.count({"is_completed": True}) == 1
+
+    run(scenario())
+
+
+def test_upserts(store):
+    async def scenario():
+        before = await store.timeline.find_one_and_update(
+            {"_id": "f:totals"},
+            {"$inc": {"seq": 2, "totals.t1": 10}, "$setOnInsert": {"kind": "totals"}},
+            upsert=True
+        )
+        assert before is None
+        before = await store.timeline.find_one_and_update(
+            {"_id": "f:totals"},
+            {"$inc": {"seq": 1, "totals.t1": 5}, "$setOnInsert": {"kind": "ignored"}},
+            upsert=True
+        )
+        assert before == {"_id": "f:totals", "seq": 2, "totals": {"t1": 10}, "kind": "totals"}
+
+        # Equality conditions of the filter seed the inserted document, operators do not
+        await store.reconciliation.update_one(
+            {"_id": "watermark", "created_at": {"$gt": "x"}}, {"$set": {"id": "r1"}}, upsert=True
+        )
+        assert await store.reconciliation.find_one({"_id": "watermark"}) == {"_id": "watermark", "id": "r1"}
+        await store.migrations.replace_one({"_id": "bootstrap"}, {"version": 1}, upsert=True)
+        await store.migrations.replace_one({"_id": "bootstrap"}, {"version": 2}, upsert=True)
+        assert await store.migrations.find({}) == [{"_id": "bootstrap", "version": 2}]
+
+    run(scenario())
+
+
+def test_unique_index_raises_duplicate_key_error(store):
+    async def scenario():
+        await store.results.create_index(IndexModel([("event_id", ASCENDING)], name="event_id_unique", unique=True))
+        await seed(store.results, {"id": "r1", "event_id": "e1"}, {"id": "r2", "event_id": "e2"})
+
+        with pytest.raises(DuplicateKeyError, match="index: event_id_unique"):
+            await store.results.insert_one({"id": "r3", "event_id": "e1"})
+        with pytest.raises(DuplicateKeyError):
+            await store.results.update_one({"id": "r2"}, {"$set": {"event_id": "e1"}})
+        # The failed writes changed nothing
+        assert await store.results.find({}, {"_id": 0}, sort=[("id", ASCENDING)]) == [
+            {"id": "r1", "event_id": "e1"}, {"id": "r2", "event_id": "e2"}
+        ]
+
+        inserted, errors = await store.results.insert_many([
+            {"id": "r3", "event_id": "e3"}, {"id": "r4", "event_id": "e1"}, {"id": "r5", "event_id": "e5"}
+        ])
+        assert inserted == 2
+        assert [index for index, _ in errors] == [1]
+        assert "event_id_unique" in errors[0][1]
+
+    run(scenario())
+
+
+def test_partial_unique_index(store):
+    async def scenario():
+        await store.results.create_index(IndexModel(
+            [("idempotency_key", ASCENDING)],
+            name="idempotency_key_unique",
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}}
+        ))
+        # Documents outside the filter never conflict
+        await seed(store.results, {"id": "r1"}, {"id": "r2"}, {"id": "r3", "idempotency_key": "k1"})
+
+        with pytest.raises(DuplicateKeyError, match="idempotency_key_unique"):
+            await store.results.insert_one({"id": "r4", "idempotency_key": "k1"})
+
+    run(scenario())
+
+
+def test_compound_unique_index(store):
+    async def scenario():
+        await store.timeline.create_index(IndexModel(
+            [("festival_id", ASCENDING), ("kind", ASCENDING), ("seq", ASCENDING)],
+            name="festival_kind_seq_unique",
+            unique=True
+        ))
+        await seed(
+            store.timeline,
+            {"festival_id": "a", "kind": "point", "seq": 1},
+            {"festival_id": "a", "kind": "point", "seq": 2},
+            {"festival_id": "b", "kind": "point", "seq": 1},
+            {"festival_id": "a", "kind": "hour", "seq": 1}
+        )
+
+        with pytest.raises(DuplicateKeyError, match="festival_kind_seq_unique"):
+            await store.timeline.insert_one({"festival_id": "a", "kind": "point", "seq": 2})
+        assert await store.timeline.delete_many({"festival_id": "a"}) == 3
+        await store.timeline.insert_one({"festival_id": "a", "kind": "point", "seq": 2})
+
+    run(scenario())
+
+
+def test_ordered_bulk_update_reports_the_failing_operation(store):
+    async def scenario():
+        await store.members.create_index(IndexModel([("name_key", ASCENDING)], name="name_key_unique", unique=True))
+        await seed(store.members, *({"id": f"m{n}", "name_key": f"k{n}", "points": 0} for n in range(3)))
+
+        with pytest.raises(BulkWriteError) as raised:
+            await store.members.bulk_update([
+                ({"id": "m0"}, {"$inc": {"points": 1}}),
+                ({"id": "m1"}, {"$set": {"name_key": "k0"}}),
+                ({"id": "m2"}, {"$inc": {"points": 1}})
+            ], ordered=True)
+
+        assert [error["index"] for error in raised.value.details["writeErrors"]] == [1]
+        assert raised.value.details["writeErrors"][0]["code"] == 11000
+        # An ordered bulk write stops at the first error
+        points = {member["id"]: member["points"] for member in await store.members.find({})}
+        assert points == {"m0": 1, "m1": 0, "m2": 0}
+
+    run(scenario())
+
+
+def test_sort_puts_missing_and_null_lowest(store):
+    async def scenario():
+        await seed(
+            store.teams,
+            {"id": "a", "total_points": 5, "created_at": "2"},
+            {"id": "b", "total_points": None, "created_at": "1"},
+            {"id": "c", "created_at": "3"},
+            {"id": "d", "total_points": 20, "created_at": "4"},
+            {"id": "e", "total_points": 5, "created_at": "1"}
+        )
+
+        async def ids(sort, **kwargs):
+            return [team["id"] for team in await store.teams.find({}, {"_id": 0, "id": 1}, sort=sort, **kwargs)]
+
+        assert await ids([("total_points", ASCENDING), ("id", ASCENDING)]) == ["b", "c", "a", "e", "d"]
+        assert await ids([("total_points", DESCENDING), ("created_at", ASCENDING)]) == ["d", "e", "a", "b", "c"]
+        assert await ids([("total_points", DESCENDING), ("created_at", ASCENDING)], skip=1, limit=2) == ["e", "a"]
+
+    run(scenario())
+
+
+def test_rank_members_breaks_ties_by_id(store):
+    async def scenario():
+        await seed(
+            store.members,
+            *({"id": member_id, "category": "Adult", "individual_points": points}
+              for member_id, points in (("m3", 5), ("m1", 5), ("m2", 9), ("m0", 1)))
+        )
+        pages = [
+            await store.rank_members({"adults": "Adult"}, offset, 2, {"_id": 0, "id": 1})
+            for offset in (0, 2)
+        ]
+
+        assert [[member["id"] for member in page["adults"]] for page in pages] == [["m2", "m1"], ["m3", "m0"]]
+        assert pages[0]["adults_total"] == 4
+
+    run(scenario())
@@ -0,0 +1,12 @@
+def test_placings_of_deleted_events_do_not_count(client, festival, result_for):
+    kept = result_for(client, festival)
+    deleted = result_for(client, festival)
+    for body in (kept, deleted):
+        assert client.post("/api/results", json=body, headers=festival).status_code == 200
+    assert client.delete(f"/api/events/{deleted['event_id']}", headers=festival).status_code == 200
+
+    stats = {team["id"]: team for team in client.get("/api/team-stats", headers=festival).json()["teams"]}
+
+    winner, runner_up = stats[kept["winner_team_id"]], stats[kept["runner_up_team_id"]]
+    assert (winner["events_won"], winner["runner_up_finishes"], winner["total_points"]) == (1, 0, 10)
+    assert (runner_up["events_won"], runner_up["runner_up_finishes"], runner_up["total_points"]) == (0, 1, 5)
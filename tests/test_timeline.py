@@ -0,0 +1,31 @@
+import asyncio
+
+import httpx
+
+
+def test_result_recorded_during_a_rebuild_lands_once(server, client, festival, monkeypatch, result_for, team_points):
+    first, second = result_for(client, festival), result_for(client, festival)
+    assert client.post("/api/results", json=first, headers=festival).status_code == 200
+    delete_many = server.store.timeline.delete_many
+
+    async def slow_delete(query):
+        # Widen the gap between clearing the old timeline and writing the new one
+        await asyncio.sleep(0.05)
+        return await delete_many(query)
+
+    monkeypatch.setattr(server.store.timeline, "delete_many", slow_delete)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            rebuild = asyncio.ensure_future(server.rebuild_timeline(festival["X-Festival"]))
+            await asyncio.sleep(0.01)
+            response = await async_client.post("/api/results", json=second, headers=festival)
+            await rebuild
+            return response
+
+    assert asyncio.run(scenario()).status_code == 200
+
+    points = client.get("/api/timeline", headers=festival).json()["points"]
+    assert [point["seq"] for point in points] == [1, 2]
+    assert points[-1]["totals"] == team_points(client, festival)